@@ -0,0 +1,206 @@
+import argparse
+import json
+import os
+import platform
+import re
+import sys
+import time
+
+from exceptions import NotLR0Exception
+from grammar import Grammar, read_grammars, read_strings
+from top_down_parser.top_down_parser import TopDownParser
+from bottom_up_parser.bottom_up_parser import BottomUpParser
+
+# Directory of the project, the grammar files and the strings are read from here
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# Grammar files of the benchmark and the directory with the strings of their grammars
+SUITES = [
+    (os.path.join("top_down_parser", "CFGs de Sergio.txt"), os.path.join("top_down_parser", "strings")),
+    (os.path.join("top_down_parser", "CFG's"), os.path.join("top_down_parser", "strings")),
+    (os.path.join("bottom_up_parser", "CFG's"), os.path.join("bottom_up_parser", "strings")),
+]
+
+
+# Function to get the best time of a function, it is called number times in each of the repeats
+def best_time(function, repeat: int, number: int = 1):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = (time.perf_counter() - start) / number
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+# Function to get the name of the strings files of a grammar, the grammar 1. of Sergio uses Sergio1.txt and
+# the Gramática N uses N.txt, N1.txt and so on, returns None if the grammar has no strings
+def corpus_key(file_name: str, name: str):
+    if name is None:
+        return None
+    match = re.match(r"(\d+)\.", name)
+    if match and "Sergio" in file_name:
+        return "Sergio" + match.group(1)
+    match = re.match(r"Gramática (\w+)\b", name)
+    if match:
+        return match.group(1)
+    return None
+
+
+# Function to get the paths of the strings files of a grammar
+def corpus_paths(strings_directory: str, key: str):
+    if key is None or not os.path.isdir(strings_directory):
+        return []
+    pattern = re.compile(re.escape(key) + r"\d*\.txt")
+    return [os.path.join(strings_directory, file_name) for file_name in sorted(os.listdir(strings_directory))
+            if pattern.fullmatch(file_name)]
+
+
+# Function to measure the parsing speed of a parser with the strings of a file
+def benchmark_corpus(parser, path: str, repeat: int, number: int):
+    strings = read_strings(path)
+    symbols = sum(len(string) for string in strings)
+    accepted = sum(parser.parse_many(strings))
+    seconds = best_time(lambda: sum(parser.parse_many(strings)), repeat, number)
+    return {
+        "corpus": os.path.relpath(path, ROOT),
+        "strings": len(strings),
+        "symbols": symbols,
+        "accepted": accepted,
+        "seconds": seconds,
+        "strings_per_second": len(strings) / seconds if seconds else None,
+        "symbols_per_second": symbols / seconds if seconds else None,
+    }
+
+
+# Function to build the LL(1) table from scratch, create_table reuses the table filled by the last check, so the
+# table is emptied first and the time includes the check and the filling of the table
+def build_ll1_table(parser: TopDownParser):
+    parser.reset_table()
+    parser.create_table()
+
+
+# Function to measure every phase of both parsers with a grammar, the start symbol is the first symbol
+# of the productions
+def benchmark_grammar(productions: list, paths: list, repeat: int, number: int):
+    result = {"productions": productions, "phases": {}, "parse": []}
+    phases = result["phases"]
+    grammar = Grammar()
+    for production in productions:
+        grammar.receive_production(production)
+    # The parsers are created without the start symbol, so the phases are not built in the constructor
+    top_down_parser = TopDownParser(grammar)
+    bottom_up_parser = BottomUpParser(grammar)
+    grammar.set_start(next(iter(grammar.productions)))
+
+    phases["first_follow"] = best_time(top_down_parser.compute_sets, repeat, number)
+    result["ll1"] = top_down_parser.is_ll1()[0]
+    phases["ll1_check"] = best_time(top_down_parser.check_ll1, repeat, number)
+    if result["ll1"]:
+        phases["ll1_table"] = best_time(lambda: build_ll1_table(top_down_parser), repeat, number)
+        for path in paths:
+            result["parse"].append(dict(parser="ll1", **benchmark_corpus(top_down_parser, path, repeat, number)))
+
+    bottom_up_parser.augment_grammar()
+    phases["lr_states"] = best_time(bottom_up_parser.build_states, repeat, number)
+    result["states"] = len(bottom_up_parser.states)
+    # The slr and lalr tables are built over the same states
+    for mode in ("slr", "lalr"):
+        bottom_up_parser.mode = mode
+        try:
+            bottom_up_parser.initialize_table()
+            result[mode] = True
+        except NotLR0Exception:
+            result[mode] = False
+            continue
+        phases[mode + "_table"] = best_time(bottom_up_parser.initialize_table, repeat, number)
+        for path in paths:
+            result["parse"].append(dict(parser=mode, **benchmark_corpus(bottom_up_parser, path, repeat, number)))
+    return result
+
+
+# Function to run the benchmark of every grammar of the suites
+def run_benchmark(repeat: int = 5, number: int = 20):
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "repeat": repeat,
+        "number": number,
+        "grammars": {},
+    }
+    for file_name, strings_directory in SUITES:
+        for index, (name, productions) in enumerate(read_grammars(os.path.join(ROOT, file_name))):
+            paths = corpus_paths(os.path.join(ROOT, strings_directory), corpus_key(file_name, name))
+            key = "{}#{}".format(file_name, index + 1)
+            try:
+                results["grammars"][key] = dict(name=name, **benchmark_grammar(productions, paths, repeat, number))
+            except Exception as exception:
+                results["grammars"][key] = {"name": name, "error": "{}: {}".format(type(exception).__name__,
+                                                                                    exception)}
+    return results
+
+
+# Function to compare the times of two benchmarks, returns the measures that are slower by more than the threshold
+# as (grammar, measure, old time, new time) tuples
+def compare_results(old: dict, new: dict, threshold: float = 1.25):
+    regressions = []
+    for key, grammar in new["grammars"].items():
+        old_grammar = old["grammars"].get(key)
+        if old_grammar is None or "error" in grammar or "error" in old_grammar:
+            continue
+        for phase, seconds in grammar["phases"].items():
+            old_seconds = old_grammar["phases"].get(phase)
+            if old_seconds and seconds > old_seconds * threshold:
+                regressions.append((key, phase, old_seconds, seconds))
+        old_parses = {(parse["parser"], parse["corpus"]): parse for parse in old_grammar["parse"]}
+        for parse in grammar["parse"]:
+            old_parse = old_parses.get((parse["parser"], parse["corpus"]))
+            if old_parse and parse["seconds"] > old_parse["seconds"] * threshold:
+                regressions.append((key, "parse {} {}".format(parse["parser"], parse["corpus"]),
+                                    old_parse["seconds"], parse["seconds"]))
+    return regressions
+
+
+# Function to print the results of a benchmark as a table
+def print_results(results: dict):
+    for key, grammar in results["grammars"].items():
+        print("{} ({})".format(key, grammar["name"]))
+        if "error" in grammar:
+            print("    error: {}".format(grammar["error"]))
+            continue
+        for phase, seconds in grammar["phases"].items():
+            print("    {:<14}{:>12.1f} µs".format(phase, seconds * 1e6))
+        for parse in grammar["parse"]:
+            print("    parse {:<4} {:<36}{:>12.0f} strings/s{:>12.0f} symbols/s".format(
+                parse["parser"], parse["corpus"], parse["strings_per_second"] or 0, parse["symbols_per_second"] or 0))
+
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(description="Benchmark of the parsers with the grammars and strings "
+                                                          "of the project")
+    argument_parser.add_argument("-o", "--output", default="benchmark.json", help="file to write the results")
+    argument_parser.add_argument("-r", "--repeat", type=int, default=5, help="repeats of each measure, "
+                                                                              "the best one is kept")
+    argument_parser.add_argument("-n", "--number", type=int, default=20, help="calls of each measure per repeat")
+    argument_parser.add_argument("-c", "--compare", help="results of a previous run to compare with")
+    argument_parser.add_argument("-t", "--threshold", type=float, default=1.25,
+                                 help="slowdown ratio reported as a regression")
+    arguments = argument_parser.parse_args()
+
+    benchmark_results = run_benchmark(arguments.repeat, arguments.number)
+    print_results(benchmark_results)
+    with open(arguments.output, "w", encoding="utf-8") as output:
+        json.dump(benchmark_results, output, indent=2, ensure_ascii=False)
+    print("Results written to {}".format(arguments.output))
+
+    if arguments.compare:
+        with open(arguments.compare, "r", encoding="utf-8") as previous:
+            found = compare_results(json.load(previous), benchmark_results, arguments.threshold)
+        for grammar_key, measure, old_time, new_time in found:
+            print("Regression in {} {}: {:.1f} µs -> {:.1f} µs".format(grammar_key, measure, old_time * 1e6,
+                                                                       new_time * 1e6))
+        if found:
+            sys.exit(1)
+        print("No regressions found")
@@ -1,190 +1,554 @@
-from collections import deque
 from grammar import Grammar
-from parser import Parser
-import re
-from exceptions import NotLR0Exception
+from parser import Parser, PushParser, bit_ids, reachable
+from exceptions import NotLR0Exception, InvalidProductionException
+from parse_tree import ParseTree
+from table_cache import grammar_fingerprint, load_table, store_table
+from table_compression import pack_rows
+from array import array
+
+# Kinds of tables the bottom-up parser can build, with the name used in the conflict messages
+MODES = {"slr": "LR(0)", "lalr": "LALR(1)", "glr": "GLR"}
 
 
 # Class to handle the bottom-up parser of a grammar
 class BottomUpParser(Parser):
-    def __init__(self, grammar: Grammar):
-        super().__init__(grammar)
+    # Phases timed by the statistics
+    profiled_phases = Parser.profiled_phases + ("closure", "goto", "successor_kernels", "build_states",
+                                                "initialize_states", "compute_lookaheads", "action", "fill_row",
+                                                "initialize_table", "update_states", "load_cached_table")
+
+    def __init__(self, grammar: Grammar, cache_dir: str = None, mode: str = "slr", profile: bool = False):
+        super().__init__(grammar, profile)
+        if mode not in MODES:
+            raise ValueError("Invalid mode: {}, it must be one of {}".format(mode, ", ".join(MODES)))
+        # Kind of table, slr uses the follow of the symbol to reduce and lalr the LALR(1) lookaheads of the state,
+        # glr uses the lookaheads like lalr but keeps every action of the cells with conflicts
+        self.mode = mode
+        # Directory of the cached tables, if it is None the tables are always built
+        self.cache_dir = cache_dir
         self.table = {}
+        # Productions of the grammar plus the augmented production S' -> S, each one as (symbol id, symbol ids)
+        self.rules = []
+        self.start_rule = None
+        # Numbers of the productions of each non-terminal id, used to compute the closure
+        self.symbol_rules = {}
+        # Text of each production as (symbol, derivation), used to print the items and the table
+        self.rule_texts = []
+        # States are frozensets of items (production number, dot position), and each state has its number
+        self.states = []
+        self.state_numbers = {}
+        # Transitions of each state, from symbol id to the number of the next state
+        self.transitions = []
+        # Kernel of each state, the items of the state with the dot after the start and the augmented item
+        self.kernels = []
+        # Lookaheads of each reduce in lalr mode, from (state number, production number) to a bitset of terminal ids
+        self.lookaheads = {}
+        # Compiled table used by the parse loop
+        self.parse_table = None
+        # Productions used to build the states and the table, None if they are not built
+        self.table_rules = None
         if grammar.start is None:
-            self.states = []
             self.new_start_symbol = None
         else:
             self.update_sets()
 
+    # Function to update the states and the table after a change of the grammar, if they were built before, then
+    # only the states and rows affected by the change are built again, returns a report with the entries that changed
     def update_sets(self):
-        if self.grammar.start is not None:
-            self.new_start_symbol = self.grammar.start + "\'"
-            self.states = []
-            length = 0
-            # Add the start symbol plus a single quote to the grammar,
-            # if it is already in the grammar, then add another single quote
-            while length == 0:
-                if self.new_start_symbol not in self.grammar.non_terminals:
-                    self.states = [self.closure({f'{self.new_start_symbol}': ["." + self.grammar.start]})]
-                    length = 1
-                else:
-                    self.new_start_symbol += "\'"
-            self.initialize_states()
+        if self.grammar.start is None:
+            return None
+        # The fingerprint must be calculated before the augmented production is added
+        fingerprint = None
+        if self.cache_dir is not None:
+            fingerprint = grammar_fingerprint(self.grammar, self.mode)
+        previous = None
+        if self.table_rules is not None:
+            previous = (self.rules, self.start_rule, self.states, self.kernels, self.transitions, dict(self.table),
+                        self.parse_table, self.lookaheads)
+            previous_start_symbol = self.new_start_symbol
+        self.table_rules = None
+        self.augment_grammar()
+        # If the table of this grammar is in the cache, then load it instead of building it
+        if fingerprint is not None and self.load_cached_table(fingerprint):
+            self.table_rules = list(self.rules)
+            return self.sets_report(True)
+        # The states can be updated if the augmented production is the same
+        if previous is not None and previous_start_symbol == self.new_start_symbol and \
+                previous[0][previous[1]] == self.rules[self.start_rule]:
+            report = self.update_states(*previous)
+        else:
+            self.build_states()
             self.initialize_table()
+            report = self.sets_report(True)
+        self.table_rules = list(self.rules)
+        if fingerprint is not None:
+            store_table(self.cache_dir, fingerprint, {"states": self.states, "kernels": self.kernels,
+                                                      "transitions": self.transitions, "table": self.table,
+                                                      "parse_table": self.parse_table, "lookaheads": self.lookaheads,
+                                                      "sets": self.stored_sets()})
+        return report
+
+    # Function to update the states and the table with the previous ones, the states without items of the changed
+    # productions and without a dot before their non-terminals keep their closure and transitions, the states keep
+    # their numbers if they still exist, and only the rows of the states that changed are filled again
+    def update_states(self, old_rules: list, old_start_rule: int, old_states: list, old_kernels: list,
+                      old_transitions: list, old_table: dict, old_parse_table, old_lookaheads: dict):
+        self.check_sets()
+        report = self.sets_report()
+        edited = []
+        edited_symbols = set()
+        for rule in range(self.start_rule):
+            old_rule = old_rules[rule] if rule < old_start_rule else None
+            if old_rule != self.rules[rule]:
+                edited.append(old_rule)
+                edited_symbols.update(production[0] for production in (old_rule, self.rules[rule])
+                                      if production is not None)
+
+        # The closure of a state changes if it has a dot before a non-terminal whose productions changed, or if it has
+        # items of a changed production, which are found walking the production from the states with a dot before its
+        # non-terminal. The states with the augmented production are always built again, because its number changes
+        affected = {0}
+        accept = old_transitions[0].get(old_rules[old_start_rule][1][0])
+        if accept is not None:
+            affected.add(accept)
+        for number, transitions in enumerate(old_transitions):
+            if not edited_symbols.isdisjoint(transitions):
+                affected.add(number)
+                for old_rule in edited:
+                    if old_rule is not None and old_rule[0] in transitions:
+                        state = number
+                        for symbol in old_rule[1]:
+                            state = old_transitions[state][symbol]
+                            affected.add(state)
+        old_kernels = list(old_kernels)
+        for number in (0, accept):
+            if number is not None:
+                old_kernels[number] = frozenset((self.start_rule, dot) if rule == old_start_rule else (rule, dot)
+                                                for rule, dot in old_kernels[number])
+        old_numbers = {kernel: number for number, kernel in enumerate(old_kernels)}
+
+        # Walk the new automaton by kernels, like initialize_states, reusing the kept states
+        kernels = [frozenset({(self.start_rule, 0)})]
+        kernel_positions = {kernels[0]: 0}
+        states = []
+        successors = []
+        index = 0
+        while index < len(kernels):
+            kernel = kernels[index]
+            number = old_numbers.get(kernel)
+            if number is not None and number not in affected:
+                state = old_states[number]
+                next_kernels = {symbol: old_kernels[target] for symbol, target in old_transitions[number].items()}
+            else:
+                state = self.closure(kernel)
+                next_kernels = self.successor_kernels(state)
+            states.append(state)
+            successors.append(next_kernels)
+            for next_kernel in next_kernels.values():
+                if next_kernel not in kernel_positions:
+                    kernel_positions[next_kernel] = len(kernels)
+                    kernels.append(next_kernel)
+            index += 1
+
+        # The states that still exist keep their numbers, the new states take the numbers of the removed ones,
+        # and the states with a number bigger than the number of states move to the numbers left free
+        count = len(kernels)
+        numbers = {kernel: old_numbers[kernel] for kernel in kernels if kernel in old_numbers}
+        free = sorted(set(range(len(old_states))).difference(numbers.values()))
+        report.removed_states = list(free)
+        new_kernels = [kernel for kernel in kernels if kernel not in numbers]
+        for position, kernel in enumerate(new_kernels):
+            numbers[kernel] = free[position] if position < len(free) else len(old_states) + position - len(free)
+        holes = [number for number in free[len(new_kernels):] if number < count]
+        moved = sorted((number, position) for position, number in enumerate(numbers[kernel] for kernel in kernels)
+                       if number >= count)
+        for hole, (number, position) in zip(holes, moved):
+            numbers[kernels[position]] = hole
+            report.renumbered_states[number] = hole
+        report.added_states = sorted(numbers[kernel] for kernel in new_kernels)
+
+        self.states = [None] * count
+        self.kernels = [None] * count
+        self.transitions = [None] * count
+        old_of = {}
+        for position, kernel in enumerate(kernels):
+            number = numbers[kernel]
+            self.states[number] = states[position]
+            self.kernels[number] = kernel
+            self.transitions[number] = {symbol: numbers[next_kernel]
+                                        for symbol, next_kernel in successors[position].items()}
+            if kernel in old_numbers:
+                old_of[number] = old_numbers[kernel]
+        self.state_numbers = {state: number for number, state in enumerate(self.states)}
+
+        # A row changes if its state is new or changed, if its transitions changed or if its reduces changed
+        changed = {number for number in range(count) if number not in old_of or old_of[number] in affected or
+                   self.transitions[number] != old_transitions[old_of[number]]}
+        # The rows with cells that reduced forever are filled again, the other rows could have changed the loops
+        old_loops = {state for state, _ in old_parse_table.loops}
+        changed.update(number for number, old in old_of.items() if old in old_loops)
+        if self.mode != "slr":
+            self.compute_lookaheads()
+            for (number, rule), lookaheads in self.lookaheads.items():
+                if number not in changed and old_lookaheads.get((old_of[number], rule)) != lookaheads:
+                    changed.add(number)
+        elif report.follow:
+            follow_changed = {self.grammar.symbol_ids[symbol] for symbol in report.follow}
+            for number in range(count):
+                if number not in changed and any(dot == len(self.rules[rule][1]) and
+                                                 self.rules[rule][0] in follow_changed
+                                                 for rule, dot in self.states[number]):
+                    changed.add(number)
+
+        # Only the rows that changed are created, the other ones are moved from the old table
+        symbols = len(self.grammar.symbols)
+        new_terminals = [terminal for terminal in self.grammar.terminals if terminal not in old_parse_table.symbol_ids]
+        new_non_terminals = [non_terminal for non_terminal in self.grammar.non_terminals
+                             if non_terminal not in old_table["Goto"][0]]
+        self.table = {"Action": {}, "Goto": {}}
+        self.parse_table = self.new_parse_table(0)
+        # The reused rows point to the actions of the conflicts of the old table
+        if self.mode == "glr":
+            self.parse_table.conflicts = old_parse_table.conflicts
+        self.parse_table.action = [None] * count
+        self.parse_table.goto = [None] * count
+        for number in range(count):
+            old = old_of.get(number)
+            if number in changed:
+                self.parse_table.action[number] = [0] * symbols
+                self.parse_table.goto[number] = [-1] * symbols
+                self.fill_row(number)
+                # Compare the new row with the row of the state before the change
+                for part in ("Action", "Goto"):
+                    old_row = old_table[part].get(old, {}) if old is not None else {}
+                    for column, value in self.table[part][number].items():
+                        if old_row.get(column) != value:
+                            report.cells.append((number, column, old_row.get(column), value))
+            else:
+                # The row is the same, with empty cells for the new symbols
+                action_row = old_table["Action"][old]
+                goto_row = old_table["Goto"][old]
+                for terminal in new_terminals:
+                    action_row[terminal] = None
+                for non_terminal in new_non_terminals:
+                    goto_row[non_terminal] = None
+                self.table["Action"][number] = action_row
+                self.table["Goto"][number] = goto_row
+                for rows, old_rows, empty in ((self.parse_table.action, old_parse_table.action, 0),
+                                              (self.parse_table.goto, old_parse_table.goto, -1)):
+                    row = old_rows[old]
+                    row.extend([empty] * (symbols - len(row)))
+                    rows[number] = row
+                # The cells of the new symbols get the default reduction of the row
+                if new_terminals or new_non_terminals:
+                    self.parse_table.set_default(number)
+        self.parse_table.break_loops()
+        return report
+
+    # Function to add the new start symbol and the augmented production to the rules of the parser
+    def augment_grammar(self):
+        self.new_start_symbol = self.grammar.start + "\'"
+        # Add the start symbol plus a single quote to the grammar,
+        # if it is already in the grammar, then add another single quote
+        while self.new_start_symbol in self.grammar.non_terminals:
+            self.new_start_symbol += "\'"
+        self.initialize_rules()
+
+    # Function to build the states of the LR(0) automaton, starting from the closure of the augmented production
+    def build_states(self):
+        self.states = []
+        self.state_numbers = {}
+        self.kernels = [frozenset({(self.start_rule, 0)})]
+        self.add_state(self.closure({(self.start_rule, 0)}))
+        self.initialize_states()
+
+    # Function to load the states and the tables from the cache, returns False if they are not in the cache
+    def load_cached_table(self, fingerprint: str):
+        cached = load_table(self.cache_dir, fingerprint)
+        if cached is None:
+            return False
+        self.states = cached["states"]
+        self.kernels = cached["kernels"]
+        self.state_numbers = {state: number for number, state in enumerate(self.states)}
+        self.transitions = cached["transitions"]
+        self.table = cached["table"]
+        self.parse_table = cached["parse_table"]
+        self.parse_table.lexer = self.build_lexer()
+        self.lookaheads = cached["lookaheads"]
+        self.restore_sets(cached["sets"])
+        return True
+
+    # Function to copy the productions of the grammar and add the augmented production S' -> S
+    def initialize_rules(self):
+        self.rules = list(self.grammar.rules)
+        self.rule_texts = [None] * len(self.rules)
+        for symbol, derivations in self.grammar.rule_ids.items():
+            for derivation, rule in derivations.items():
+                self.rule_texts[rule] = (symbol, derivation)
+        # The new start symbol is not interned in the grammar, it is shared with other parsers, so the augmented
+        # production uses the id -1, it never has a goto because its reduce is the accept
+        self.start_rule = len(self.rules)
+        self.rules.append((-1, (self.grammar.symbol_ids[self.grammar.start],)))
+        self.rule_texts.append((self.new_start_symbol, self.grammar.start))
+        self.symbol_rules = {}
+        for rule, production in enumerate(self.rules):
+            if production is not None:
+                self.symbol_rules.setdefault(production[0], []).append(rule)
 
     # Function to check if a state is in the states array
-    def add_state(self, state: dict):
-        # If the state is not in the states set and is not empty, then add it to the states array
-        if state not in self.states and state is not None:
+    def add_state(self, state: frozenset):
+        # If the state is not in the states dictionary and is not empty, then add it to the states array
+        if state is not None and state not in self.state_numbers:
+            self.state_numbers[state] = len(self.states)
             self.states.append(state)
             return True
         return False
 
-    # Function to calculate the closure of a state
-    def closure(self, state: dict):
-        new_state = state.copy()
-        pattern = re.compile(r'\.(?P<non_terminal>[A-Z]\'*)')
-        # For each symbol in the state
-        for symbol, productions in state.items():
-            # For each production of the symbol
-            for production in productions:
-                # Check if the production has a dot before a non-terminal
-                for match in pattern.finditer(production):
-                    # Get the non-terminal after the dot
-                    non_terminal = match.group("non_terminal")
-                    # If the non-terminal is not in the state, then add it to the state
-                    if non_terminal not in new_state:
-                        new_state[non_terminal] = []
-                    # For each derivation of the non-terminal
-                    for derivation in self.grammar.productions[non_terminal]:
-                        # If the derivation is not in the state, then add it to the state
-                        if "." + derivation not in new_state[non_terminal]:
-                            new_state[non_terminal].append("." + derivation)
-        # If the new state is different from the old state, then call the closure function again
-        if new_state != state:
-            return self.closure(new_state)
-        return new_state
+    # Function to calculate the closure of a set of items
+    def closure(self, state):
+        closure = set(state)
+        pending = list(state)
+        # Non-terminals whose productions are already in the closure
+        expanded = set()
+        while pending:
+            rule, dot = pending.pop()
+            symbols = self.rules[rule][1]
+            # Check if the item has a dot before a non-terminal that hasn't been expanded
+            if dot < len(symbols) and symbols[dot] in self.symbol_rules and symbols[dot] not in expanded:
+                expanded.add(symbols[dot])
+                # Add every production of the non-terminal with the dot at the start
+                for new_rule in self.symbol_rules[symbols[dot]]:
+                    if (new_rule, 0) not in closure:
+                        closure.add((new_rule, 0))
+                        pending.append((new_rule, 0))
+        return frozenset(closure)
 
     # Function to calculate the goto of a state
-    def goto(self, state: dict, symbol: str):
-        new_state = {}
-        if symbol in self.grammar.non_terminals:
-            pattern = "\." + symbol + "(?!\')"
-        else:
-            pattern = "\.[" + symbol + "]"
-        # For each symbol in the state
-        for non_terminal, productions in state.items():
-            # For each item of the symbol
-            for item in productions:
-                # Check if the item has a dot before the symbol
-                match = re.search(pattern, item)
-                if match is not None:
-                    # Get the index of the symbol in the item
-                    index = item.index("." + symbol)
-                    # Add the symbol to the new state
-                    if non_terminal not in new_state:
-                        new_state[non_terminal] = []
-                    # Add the item to the new state
-                    new_state[non_terminal].append(item[:index] + symbol + "." + item[index + len(symbol) + 1:])
-
+    def goto(self, state: frozenset, symbol: str):
+        symbol = self.grammar.symbol_ids.get(symbol)
+        # Move the dot over the symbol in every item that has the dot before it
+        kernel = set()
+        for rule, dot in state:
+            symbols = self.rules[rule][1]
+            if dot < len(symbols) and symbols[dot] == symbol:
+                kernel.add((rule, dot + 1))
         # If the new state is not empty, then calculate the closure of the new state
-        if len(new_state) > 0:
-            return self.closure(new_state)
+        if len(kernel) > 0:
+            return self.closure(kernel)
 
-    # Function to initialize the states array
+    # Function to build the states array and the transitions between states with a single worklist pass
     def initialize_states(self):
-        length = len(self.states)
-        # For each state in the states array
-        for state in self.states:
-            # For each terminal in the grammar
-            for terminal in self.grammar.terminals:
-                # Calculate the goto of the state with the terminal
-                new_state = self.goto(state, terminal)
-                # Add the new state to the states array
-                self.add_state(new_state)
-
-            # For each non-terminal in the grammar
-            for non_terminal in self.grammar.non_terminals:
-                # Calculate the goto of the state with the non-terminal
-                new_state = self.goto(state, non_terminal)
-                # Add the new state to the states array
-                self.add_state(new_state)
-        # If the length of the states array is different from the length before the loop, then call the function again
-        if length != len(self.states):
-            self.initialize_states()
+        # Transitions of each state, from symbol id to the number of the next state
+        self.transitions = []
+        # Number of the state of each kernel, so the closure of a kernel is computed only once
+        kernel_numbers = {}
+        index = 0
+        # Every state added to the states array is processed once, in order
+        while index < len(self.states):
+            transitions = {}
+            for symbol, kernel in self.successor_kernels(self.states[index]).items():
+                if kernel not in kernel_numbers:
+                    new_state = self.closure(kernel)
+                    if self.add_state(new_state):
+                        self.kernels.append(kernel)
+                    kernel_numbers[kernel] = self.state_numbers[new_state]
+                transitions[symbol] = kernel_numbers[kernel]
+            self.transitions.append(transitions)
+            index += 1
+
+    # Function to group the items of a state by the symbol after the dot, moving the dot over it, so each group is
+    # the kernel of the goto of the state with the symbol and only the symbols that follow a dot are tried
+    def successor_kernels(self, state: frozenset):
+        kernels = {}
+        for rule, dot in state:
+            symbols = self.rules[rule][1]
+            if dot < len(symbols):
+                kernels.setdefault(symbols[dot], set()).add((rule, dot + 1))
+        return {symbol: frozenset(kernel) for symbol, kernel in kernels.items()}
 
     # Function to initialize the table
     def initialize_table(self):
-        # Action and Goto tables
+        # Action and Goto tables, as strings to print them and compiled to parse
         self.table["Action"] = {}
         self.table["Goto"] = {}
+        self.check_sets()
+        if self.mode != "slr":
+            self.compute_lookaheads()
+        self.parse_table = self.new_parse_table(len(self.states))
         # For each state in the states array
         for i in range(len(self.states)):
-            self.table["Action"][i] = {'$': None}
-            self.table["Goto"][i] = {}
-            # For each terminal in the grammar
-            for terminal in self.grammar.terminals:
-                self.table["Action"][i][terminal] = None
-            # Put the values for the row
-            self.action(self.states[i])
-            # For each non-terminal in the grammar
-            for non_terminal in self.grammar.non_terminals:
-                goto = self.goto(self.states[i], non_terminal)
-                # Verify if the cell is empty, otherwise there is a conflict
-                if non_terminal in self.table["Goto"][i] and self.table["Goto"][i][non_terminal] is not None:
-                    raise NotLR0Exception(f'The grammar is not LR(0) because there is a conflict in the state'
-                                          f' {self.states.index(i)} in the {non_terminal} column')
-                # If the goto is not empty
-                if goto is not None:
-                    self.table["Goto"][i][non_terminal] = self.states.index(goto)
-                else:
-                    self.table["Goto"][i][non_terminal] = None
+            self.fill_row(i)
+        self.parse_table.break_loops()
+
+    # Function to create the compiled table of the grammar with empty rows for a number of states, in glr mode the
+    # table keeps the cells with conflicts
+    def new_parse_table(self, states: int):
+        table_class = GLRTable if self.mode == "glr" else LRTable
+        table = table_class({terminal: self.grammar.symbol_ids[terminal] for terminal in self.grammar.terminals},
+                            states, len(self.grammar.symbols), self.rules, self.start_rule)
+        table.lexer = self.build_lexer()
+        if self.mode == "glr":
+            table.cyclic = self.is_cyclic()
+        return table
+
+    # Function to know if a non-terminal of the grammar derives itself, A ⇒+ A, it happens when a production of a
+    # non-terminal has a symbol that derives it and the other symbols of the production are nullable
+    def is_cyclic(self):
+        units = {}
+        for rule in self.grammar.rules:
+            if rule is not None:
+                non_terminal, symbols = rule
+                for position, symbol in enumerate(symbols):
+                    if symbol in self.first_sets and all(other in self.nullable for other in
+                                                         symbols[:position] + symbols[position + 1:]):
+                        units.setdefault(non_terminal, set()).add(symbol)
+        return any(non_terminal in reachable(derived, lambda symbol: units.get(symbol, ()))
+                   for non_terminal, derived in units.items())
+
+    # Function to fill the action and goto rows of a state
+    def fill_row(self, i: int):
+        self.table["Action"][i] = {'$': None}
+        self.table["Goto"][i] = {}
+        # For each terminal in the grammar
+        for terminal in self.grammar.terminals:
+            self.table["Action"][i][terminal] = None
+        # Put the values for the row
+        self.action(self.states[i])
+        # For each non-terminal in the grammar, the goto is the transition of the state with it
+        for non_terminal in self.grammar.non_terminals:
+            goto = self.transitions[i].get(self.grammar.symbol_ids[non_terminal])
+            self.table["Goto"][i][non_terminal] = goto
+            if goto is not None:
+                self.parse_table.goto[i][self.grammar.symbol_ids[non_terminal]] = goto
+        self.parse_table.set_default(i)
+
+    # Function to compute the LALR(1) lookaheads of the reduces over the LR(0) states, with the relations of
+    # DeRemer and Pennello, the lookaheads are propagated through the transitions of the non-terminals
+    def compute_lookaheads(self):
+        # A non-terminal without productions is not a terminal, even if there is nothing to reduce to it
+        non_terminals = self.grammar.non_terminal_ids
+        # Transitions of the non-terminals, as (state number, symbol id)
+        nodes = [(state, symbol) for state, transitions in enumerate(self.transitions)
+                 for symbol in transitions if symbol in non_terminals]
+        # Terminals that can be read right after each transition, the end marker follows the start symbol
+        direct_reads = {}
+        reads = {}
+        for state, symbol in nodes:
+            next_state = self.transitions[state][symbol]
+            direct_reads[(state, symbol)] = sum(1 << next_symbol for next_symbol in self.transitions[next_state]
+                                                if next_symbol not in non_terminals)
+            reads[(state, symbol)] = [(next_state, next_symbol) for next_symbol in self.transitions[next_state]
+                                      if next_symbol in self.nullable]
+        start = self.rules[self.start_rule][1][0]
+        if (0, start) in direct_reads:
+            direct_reads[(0, start)] |= 1
+        read_sets = digraph(nodes, reads, direct_reads)
+
+        # A transition includes another when its symbol ends a production of the other one, except for nullable
+        # symbols, and each reduce looks back to the transitions where its production started
+        includes = {}
+        lookback = {}
+        for state, symbol in nodes:
+            for rule in self.symbol_rules.get(symbol, ()):
+                symbols = self.rules[rule][1]
+                current = state
+                path = []
+                for next_symbol in symbols:
+                    path.append((current, next_symbol))
+                    current = self.transitions[current][next_symbol]
+                lookback.setdefault((current, rule), []).append((state, symbol))
+                for position in range(len(symbols) - 1, -1, -1):
+                    if path[position][1] in non_terminals:
+                        includes.setdefault(path[position], []).append((state, symbol))
+                    if symbols[position] not in self.nullable:
+                        break
+        follow_sets = digraph(nodes, includes, read_sets)
+
+        self.lookaheads = {}
+        for reduce, transitions in lookback.items():
+            lookaheads = 0
+            for transition in transitions:
+                lookaheads |= follow_sets[transition]
+            self.lookaheads[reduce] = lookaheads
 
     # Function to calculate the action of a state
-    def action(self, state: dict):
-        # For each symbol in the state
+    def action(self, state: frozenset):
+        number = self.state_numbers[state]
+        # For each item of the state
+        for rule, dot in state:
+            non_terminal, symbols = self.rules[rule]
+            # Ask if the dot is in the last position of the item
+            if dot == len(symbols):
+                # If the symbol is the start symbol, add the accept action in the $ column
+                if rule == self.start_rule:
+                    self.set_action(number, 0, "accept", -(rule + 1))
+                else:
+                    symbol, derivation = self.rule_texts[rule]
+                    action = "reduce " + symbol + "->" + derivation
+                    if self.mode != "slr":
+                        lookaheads = self.lookaheads.get((number, rule), 0)
+                    else:
+                        lookaheads = self.follow_sets[non_terminal]
+                    for terminal_id in bit_ids(lookaheads):
+                        self.set_action(number, terminal_id, action, -(rule + 1))
+            # If the symbol after the dot is a terminal, add the shift to the next state
+            elif self.grammar.symbols[symbols[dot]] in self.grammar.terminals:
+                next_state = self.transitions[number][symbols[dot]]
+                self.set_action(number, symbols[dot], "shift " + str(next_state), next_state + 1)
+
+    # Function to set an action of a state for a terminal id, a cell with another action is a conflict, in glr mode
+    # the cell keeps every action and otherwise the grammar can't be parsed
+    def set_action(self, number: int, terminal_id: int, action: str, value: int):
+        row = self.table["Action"][number]
+        terminal = self.grammar.symbols[terminal_id]
+        if row[terminal] is None:
+            row[terminal] = action
+            self.parse_table.action[number][terminal_id] = value
+        elif action not in row[terminal].split("|"):
+            if self.mode != "glr":
+                raise NotLR0Exception(f'The grammar is not {MODES[self.mode]} because there is a conflict in the state '
+                                      f'{number}:{self.state_to_dict(self.states[number])} in the {terminal} column')
+            row[terminal] += "|" + action
+            self.parse_table.add_conflict(number, terminal_id, value)
+
+    # Function to write an item as a derivation with a dot, like E->E.+T
+    def item_to_str(self, item: tuple):
+        rule, dot = item
+        symbols = [self.grammar.symbols[symbol] for symbol in self.rules[rule][1]]
+        # The dot is written before epsilon in the empty productions
+        if len(symbols) == 0:
+            return ".ε"
+        return "".join(symbols[:dot]) + "." + "".join(symbols[dot:])
+
+    # Function to convert a state into a dictionary from non-terminal to its items written as strings,
+    # the kernel items go first
+    def state_to_dict(self, state: frozenset):
+        state_dict = {}
+        for item in sorted(state, key=lambda item: (item[0] != self.start_rule, item[1] == 0, item)):
+            state_dict.setdefault(self.rule_texts[item[0]][0], []).append(self.item_to_str(item))
+        return state_dict
+
+    # Function to convert a dictionary from non-terminal to items written as strings (like {"E": [".E+T"]})
+    # into a state of the parser
+    def state_from_dict(self, state: dict):
+        items = set()
         for symbol, productions in state.items():
-            # For each item of the symbol
             for production in productions:
-                dot_index = production.index(".")
-                # Ask if the dot is in the last position of the item
-                if dot_index == len(production) - 1 or production[dot_index + 1] == "ε":
-                    # If the symbol is the start symbol
-                    if symbol == self.new_start_symbol:
-                        # Add the accept action to the action table of the state, in the $ column
-                        # just if the cell is empty, otherwise there is a conflict
-                        if self.table["Action"][self.states.index(state)]["$"] is None:
-                            self.table["Action"][self.states.index(state)]["$"] = "accept"
-                        else:
-                            raise NotLR0Exception(f'The grammar is not LR(0) because there is a conflict in the state'
-                                                  f' {self.states.index(state)}:{state} in the $ column')
-                    else:
-                        for terminal in self.follow(symbol):
-                            # If the symbol is not in the action table of the state
-                            if self.table["Action"][self.states.index(state)][terminal] is None:
-                                # Add the symbol to the action table of the state
-                                if not dot_index == len(production) - 1:
-                                    action = "reduce " + symbol + "->" + production[-1]
-                                else:
-                                    action = "reduce " + symbol + "->" + production[:-1]
-                                self.table["Action"][self.states.index(state)][terminal] = action
-
-                            else:
-                                raise NotLR0Exception(f'The grammar is not LR(0) because there is a conflict in the state '
-                                                      f'{self.states.index(state)}:{state} in the {terminal} column')
-                else:
-                    # Get the symbol after the dot
-                    next_symbol = production[dot_index + 1]
-                    # If the symbol is a terminal
-                    if next_symbol in self.grammar.terminals:
-                        action = "shift " + str(self.states.index(self.goto(state, next_symbol)))
-                        # If the symbol is not in the action table of the state
-                        if self.table["Action"][self.states.index(state)][next_symbol] is None:
-                            # Add the symbol to the action table of the state
-                            self.table["Action"][self.states.index(state)][next_symbol] = action
-                        elif self.table["Action"][self.states.index(state)][next_symbol] != action:
-                            raise NotLR0Exception(f'The grammar is not LR(0) because there is a conflict in the state'
-                                                  f' {self.states.index(state)}:{state} in the {next_symbol} column')
+                # Count the symbols before the dot, and look for the production without the dot
+                dot = production.find(".")
+                derivation = production.replace(".", "", 1)
+                rule = None
+                if symbol == self.new_start_symbol and derivation == self.grammar.start:
+                    rule = self.start_rule
+                elif symbol in self.grammar.rule_ids:
+                    rule = self.grammar.rule_ids[symbol].get(derivation)
+                    if rule is None and derivation == "ε":
+                        rule = self.grammar.rule_ids[symbol].get("")
+                if dot == -1 or rule is None:
+                    raise InvalidProductionException(f"Invalid item: {symbol} -> {production}, it must be a "
+                                                     f"production of the grammar with a dot")
+                items.add((rule, len(self.grammar.split(production[:dot]))))
+        return frozenset(items)
 
     # Length of cells in action table
     def cell_length(self):
@@ -284,59 +648,741 @@ class BottomUpParser(Parser):
     def print_states(self):
         for i in range(len(self.states)):
             print("State " + str(i) + ":")
-            for symbol, productions in self.states[i].items():
+            for symbol, productions in self.state_to_dict(self.states[i]).items():
                 for production in productions:
                     print(symbol + "->" + production, end=" | ")
             print()
 
-    # Function to calculate the length of a production
-    @staticmethod
-    def production_length(production: str):
-        non_terminal_pattern = re.compile(r"([A-Z]\'*)")
-        length = 0
-        # If the production is epsilon we return 0, because the length of empty string is 0
-        if production == "ε":
-            return 0
-        # For each non-terminal in the production we add 1 to the length,
-        # and we remove the non-terminal from the production
-        for non_terminal in non_terminal_pattern.findall(production):
-            length += 1
-            production = production.replace(non_terminal, "", 1)
-        # For each terminal in the production we add 1 to the length
-        for _ in production:
-            length += 1
-        return length
+    # Function to get the compiled table
+    def compiled_table(self):
+        return self.parse_table
 
     # Function to parse a string
     def parse(self, string: str):
-        action_pattern = re.compile(
-            r"(?P<Action>shift|reduce) ((?P<non_terminal>[A-Z]\'*)\s?->\s?(?P<production>.+)|(?P<state>\d+))")
+        return self.parse_table.parse(string)
+
+    # Function to parse a string building its parse tree, returns None if the string is not accepted
+    def parse_tree(self, string: str):
+        return self.parse_table.parse_tree(string, self.grammar.symbols)
+
+
+# Function to compute the smallest sets that contain the initial set of each node and the sets of the nodes related
+# to it, the strongly connected nodes share the same set, it is the digraph algorithm of DeRemer and Pennello
+# without recursion. The sets are bitsets of terminal ids
+def digraph(nodes: list, relation: dict, initial: dict):
+    sets = {node: initial.get(node, 0) for node in nodes}
+    done = len(nodes) + 1
+    depth = dict.fromkeys(nodes, 0)
+    stack = []
+    for root in nodes:
+        if depth[root] != 0:
+            continue
+        stack.append(root)
+        depth[root] = len(stack)
+        calls = [(root, iter(relation.get(root, ())), 1)]
+        while calls:
+            node, related, node_depth = calls[-1]
+            for next_node in related:
+                if depth[next_node] == 0:
+                    stack.append(next_node)
+                    depth[next_node] = len(stack)
+                    calls.append((next_node, iter(relation.get(next_node, ())), len(stack)))
+                    break
+                depth[node] = min(depth[node], depth[next_node])
+                sets[node] |= sets[next_node]
+            else:
+                calls.pop()
+                # The node is the root of its component, so every node of the component gets its set
+                if depth[node] == node_depth:
+                    while True:
+                        top = stack.pop()
+                        depth[top] = done
+                        sets[top] = sets[node]
+                        if top == node:
+                            break
+                if calls:
+                    parent = calls[-1][0]
+                    depth[parent] = min(depth[parent], depth[node])
+                    sets[parent] |= sets[node]
+    return sets
+
+
+# Class with the compiled table of the bottom-up parser, every cell is an integer, so the parse loop only indexes
+# lists. An action is 0 for an error, state + 1 for a shift and -(production + 1) for a reduce, the reduce of the
+# augmented production is the accept
+class LRTable:
+    def __init__(self, symbol_ids: dict, states: int, symbols: int, rules: list, accept_rule: int):
+        # Ids of the terminals, used to translate the input
+        self.symbol_ids = symbol_ids
+        # Action and goto rows of each state, indexed by symbol id, a goto of -1 is an empty cell
+        self.action = [[0] * symbols for _ in range(states)]
+        self.goto = [[-1] * symbols for _ in range(states)]
+        # Length of the derivation and id of the non-terminal of each production, to apply a reduce
+        self.rule_lengths = [len(rule[1]) if rule is not None else 0 for rule in rules]
+        self.rule_symbols = [rule[0] if rule is not None else -1 for rule in rules]
+        self.accept_rule = accept_rule
+        # Lexer of the tokens of the grammar, None if every terminal is a character
+        self.lexer = None
+        # Action row shared by the states that only reduce a production, by the reduce action
+        self.reduce_rows = {}
+        # Cells of reduces of the empty string that would reduce forever, as (state, terminal id), they are errors
+        self.loops = []
+
+    # Function to translate a string into the list of its terminal ids ending with the $ id, returns None if the
+    # string has a symbol that is not a terminal. With a lexer the position where each token starts and ends is
+    # added to starts and ends, without it every symbol is a character
+    def translate(self, string: str, starts: list = None, ends: list = None):
+        if self.lexer is not None:
+            return self.lexer.tokenize(string, starts, ends)
+        symbol_ids = self.symbol_ids
+        tokens = [symbol_ids.get(symbol, -1) for symbol in string]
+        if -1 in tokens:
+            return None
+        tokens.append(0)
+        return tokens
+
+    # Function to set the default reduction of the row of a state, the empty cells of a row with reduces get its
+    # most common reduce, so a state that only reduces a production reduces it with any symbol, and its row is
+    # shared with the other states that only reduce it. A wrong symbol is still found before it is shifted
+    def set_default(self, state: int):
+        row = self.action[state]
+        default = self.default_action(row, state)
+        if default == 0:
+            return
+        if row.count(default) + row.count(0) == len(row):
+            shared = self.reduce_rows.get(default)
+            if shared is None or len(shared) != len(row):
+                shared = self.reduce_rows[default] = [default] * len(row)
+            self.action[state] = shared
+        else:
+            self.action[state] = [default if action == 0 else action for action in row]
+
+    # Function to get the most common reduce of an action row, the accept is never a default, returns 0 if the row
+    # has no reduces. With the state of the row, a reduce of the empty string whose goto is the same state is never
+    # a default either, with any other symbol it would be reduced again forever
+    def default_action(self, row: list, state: int = None):
+        accept = -self.accept_rule - 1
+        counts = {}
+        for action in row:
+            if action < 0 and action != accept:
+                counts[action] = counts.get(action, 0) + 1
+        if state is not None:
+            for action in list(counts):
+                rule = -action - 1
+                if not self.rule_lengths[rule] and self.goto[state][self.rule_symbols[rule]] == state:
+                    del counts[action]
+        return max(counts, key=counts.get) if counts else 0
+
+    # Function to find the cells that reduce forever without shifting and make them errors. A reduce of the empty
+    # string pushes a state without popping one, so with a hidden left recursion, like S -> AS with A -> ε, the same
+    # state comes back to the top over a stack that only grows, and the string can never be accepted. Every cell is
+    # checked before any of them changes, so the errors don't depend on the order of the states
+    def break_loops(self):
+        rule_lengths = self.rule_lengths
+        empty_actions = {-rule - 1 for rule, symbol in enumerate(self.rule_symbols)
+                         if symbol != -1 and not rule_lengths[rule]}
+        if not empty_actions:
+            return
+        terminals = [0] + sorted(self.symbol_ids.values())
+        self.loops = [(state, token) for state, row in enumerate(self.action) for token in terminals
+                      if row[token] in empty_actions and self.reduces_forever(state, token)]
+        for state, token in self.loops:
+            # The row is copied, it could be shared with other states
+            row = self.action[state] = list(self.action[state])
+            row[token] = 0
+
+    # Function to know if the reduces of a state with a terminal go on forever, they are followed over a stack that
+    # starts with the state, if a state comes back to the top while the states below it were never popped, then
+    # the steps from it repeat on top of it forever. A shift, an error, the accept or popping the first state end them
+    def reduces_forever(self, state: int, token: int):
+        action_rows = self.action
+        goto_rows = self.goto
+        rule_lengths = self.rule_lengths
+        rule_symbols = self.rule_symbols
+        accept = -self.accept_rule - 1
+        stack = [state]
+        while True:
+            action = action_rows[stack[-1]][token]
+            if action >= 0 or action == accept:
+                return False
+            rule = -action - 1
+            length = rule_lengths[rule]
+            if length >= len(stack):
+                return False
+            if length:
+                del stack[-length:]
+            next_state = goto_rows[stack[-1]][rule_symbols[rule]]
+            if next_state in stack:
+                return True
+            stack.append(next_state)
+
+    # Function to get the goto rows skipping the states that only reduce a unit production A -> B, the goto of B
+    # goes straight to the goto of A, because the reduce would pop the state of B and go to A from the same state.
+    # A cycle of unit productions can't be in an LR grammar, but it is never followed
+    def unit_gotos(self):
+        accept = -self.accept_rule - 1
+        # Production of the states that only reduce a unit production
+        unit_states = {}
+        for state, row in enumerate(self.action):
+            actions = set(row)
+            actions.discard(0)
+            if len(actions) == 1:
+                action = actions.pop()
+                if action < 0 and action != accept and self.rule_lengths[-action - 1] == 1:
+                    unit_states[state] = -action - 1
+        gotos = []
+        for state, goto_row in enumerate(self.goto):
+            row = list(goto_row)
+            for column, target in enumerate(row):
+                seen = set()
+                while target in unit_states and target not in seen:
+                    seen.add(target)
+                    skipped = self.goto[state][self.rule_symbols[unit_states[target]]]
+                    if skipped == -1:
+                        break
+                    target = skipped
+                row[column] = target
+            gotos.append(row)
+        return gotos
+
+    # Function to parse a string
+    def parse(self, string: str):
+        tokens = self.translate(string)
+        if tokens is None:
+            return False
+        return self.recognize(tokens)
+
+    # Function to recognize the terminal ids of a string ending with the $ id, any sequence of integers that can be
+    # indexed, like a list or bytes
+    def recognize(self, tokens):
+        action_rows = self.action
+        goto_rows = self.goto
+        rule_lengths = self.rule_lengths
+        rule_symbols = self.rule_symbols
         # Stack of states and adding the first state
-        stack = deque()
-        stack.append(0)
-        # Adding the dollar sign to the end of the string
-        string += "$"
+        stack = [0]
         # Index of the string
         index = 0
+        token = tokens[0]
+        while True:
+            action = action_rows[stack[-1]][token]
+            # If the action is shift we add the state to the stack, and we move to the next symbol
+            if action > 0:
+                stack.append(action - 1)
+                index += 1
+                token = tokens[index]
+            # If the action is reduce we remove the symbols of the derivation and add the goto state to the stack
+            elif action < 0:
+                rule = -action - 1
+                if rule == self.accept_rule:
+                    return True
+                length = rule_lengths[rule]
+                if length:
+                    del stack[-length:]
+                stack.append(goto_rows[stack[-1]][rule_symbols[rule]])
+            # If the action is an error we return False
+            else:
+                return False
+
+    # Function to recognize the terminal ids of a string like recognize, adding its steps and the states and cells
+    # it reads to the statistics, a goto is a cell of the state below the reduced symbols
+    def profile(self, tokens, stats):
+        action_rows = self.action
+        goto_rows = self.goto
+        rule_lengths = self.rule_lengths
+        rule_symbols = self.rule_symbols
+        row_counts = stats.rows
+        cell_counts = stats.cells
+        shifts = 0
+        reduces = 0
+        lookups = 0
+        stack = [0]
+        index = 0
+        token = tokens[0]
         while True:
             state = stack[-1]
-            # State action
-            action = self.table["Action"][state][string[index]]
-            # If the action is None we return False
-            if action is None:
+            row_counts[state] += 1
+            cell_counts[state, token] += 1
+            lookups += 1
+            action = action_rows[state][token]
+            if action > 0:
+                shifts += 1
+                stack.append(action - 1)
+                index += 1
+                token = tokens[index]
+            elif action < 0:
+                rule = -action - 1
+                if rule == self.accept_rule:
+                    accepted = True
+                    break
+                reduces += 1
+                length = rule_lengths[rule]
+                if length:
+                    del stack[-length:]
+                symbol = rule_symbols[rule]
+                cell_counts[stack[-1], symbol] += 1
+                lookups += 1
+                stack.append(goto_rows[stack[-1]][symbol])
+            else:
+                accepted = False
+                break
+        stats.add_parse(accepted, lookups, shift=shifts, reduce=reduces)
+        return accepted
+
+    # Function to parse a string building its parse tree, returns None if the string is not accepted.
+    # It is the same loop of parse, with a node for each symbol of the stack, the node of a non-terminal is added
+    # when its production is reduced, so the children are added before their parent
+    def parse_tree(self, string: str, symbol_names: list):
+        token_starts = []
+        token_ends = []
+        tokens = self.translate(string, token_starts, token_ends)
+        if tokens is None:
+            return None
+        tree = ParseTree(string, symbol_names)
+        symbols = tree.symbols
+        first_child = tree.first_child
+        next_sibling = tree.next_sibling
+        starts = tree.start
+        ends = tree.end
+        # Bound methods to add the values of a node, called for every symbol of the string
+        add_symbol = symbols.append
+        add_child = first_child.append
+        add_sibling = next_sibling.append
+        add_start = starts.append
+        add_end = ends.append
+        action_rows = self.action
+        goto_rows = self.goto
+        rule_lengths = self.rule_lengths
+        rule_symbols = self.rule_symbols
+        stack = [0]
+        # Node of each symbol of the stack, the first state has no symbol
+        nodes = []
+        index = 0
+        token = tokens[0]
+        while True:
+            action = action_rows[stack[-1]][token]
+            # If the action is shift we add the state and the node of the terminal
+            if action > 0:
+                stack.append(action - 1)
+                nodes.append(len(symbols))
+                add_symbol(token)
+                add_child(-1)
+                add_sibling(-1)
+                add_start(index)
+                add_end(index + 1)
+                index += 1
+                token = tokens[index]
+            # If the action is reduce the nodes of the derivation are the children of the node of the non-terminal
+            elif action < 0:
+                rule = -action - 1
+                if rule == self.accept_rule:
+                    tree.root = nodes[-1]
+                    if token_starts:
+                        tree.map_spans(token_starts, token_ends)
+                    return tree
+                length = rule_lengths[rule]
+                node = len(symbols)
+                add_symbol(rule_symbols[rule])
+                add_sibling(-1)
+                if length:
+                    children = nodes[-length:]
+                    del nodes[-length:]
+                    del stack[-length:]
+                    add_child(children[0])
+                    for child in range(length - 1):
+                        next_sibling[children[child]] = children[child + 1]
+                    add_start(starts[children[0]])
+                    add_end(ends[children[-1]])
+                else:
+                    # A production to epsilon derives an empty span in the current position
+                    add_child(-1)
+                    add_start(index)
+                    add_end(index)
+                nodes.append(node)
+                stack.append(goto_rows[stack[-1]][rule_symbols[rule]])
+            else:
+                return None
+
+    # Function to create a push parser that reads the string in chunks
+    def push_parser(self):
+        return LRPushParser(self)
+
+    # Function to get the table compressed with row displacement, it parses the same strings using less memory
+    def compress(self):
+        return CompressedLRTable(self)
+
+
+# Value of the first cell with a conflict in a GLR table, the cell CONFLICT + n has the actions of the conflict n
+CONFLICT = 1 << 30
+
+
+# Class with the compiled table of the generalized LR parser, the cells with more than one action point to the list
+# of their actions, so a grammar with conflicts can be parsed. The string is read like in the LRTable until a cell
+# with a conflict is found, then the stack becomes a graph-structured stack where each branch of the conflict is a
+# head, and the heads with the same state in the same position are a single node that links to the nodes below of
+# every branch. While there is a single head with a single action, the steps are deterministic again
+class GLRTable(LRTable):
+    def __init__(self, symbol_ids: dict, states: int, symbols: int, rules: list, accept_rule: int):
+        super().__init__(symbol_ids, states, symbols, rules, accept_rule)
+        # Actions of each cell with a conflict
+        self.conflicts = []
+        # True if a non-terminal derives itself, then a deterministic step could reduce forever, so the string is
+        # read with the graph-structured stack from the start, where the heads are always merged
+        self.cyclic = False
+
+    # The rows have no default reductions, a reduce with a terminal that can't follow it could be repeated forever
+    # with the productions of the empty string in the deterministic steps
+    def set_default(self, state: int):
+        pass
+
+    # The loops are only made errors without conflicts, then the table is read by the deterministic loops of the
+    # LRTable, with conflicts recognize finds them with the graph-structured stack
+    def break_loops(self):
+        if not self.conflicts:
+            super().break_loops()
+
+    # Function to add an action to a cell, the cell with its old action becomes a conflict
+    def add_conflict(self, state: int, terminal: int, value: int):
+        cell = self.action[state][terminal]
+        if cell >= CONFLICT:
+            actions = self.conflicts[cell - CONFLICT]
+            if value not in actions:
+                actions.append(value)
+        else:
+            self.conflicts.append([cell, value])
+            self.action[state][terminal] = CONFLICT + len(self.conflicts) - 1
+
+    # Function to get the actions of a cell, an empty tuple for an error
+    def cell_actions(self, state: int, token: int):
+        cell = self.action[state][token]
+        if cell >= CONFLICT:
+            return self.conflicts[cell - CONFLICT]
+        return (cell,) if cell else ()
+
+    # Function to get the productions reduced by a state with a terminal, without the accept
+    def reduces(self, state: int, token: int):
+        return [-action - 1 for action in self.cell_actions(state, token)
+                if action < 0 and action != -self.accept_rule - 1]
+
+    # Function to recognize the terminal ids of a string ending with the $ id, it is the loop of the LRTable until a
+    # cell with a conflict is found. The reduces of the empty string since the last shift are counted, with more of
+    # them than states the stack could grow forever, so it goes on with the graph-structured stack
+    def recognize(self, tokens):
+        if self.cyclic:
+            return self.recognize_generalized(tokens, 0, [0])
+        action_rows = self.action
+        goto_rows = self.goto
+        rule_lengths = self.rule_lengths
+        rule_symbols = self.rule_symbols
+        limit = len(action_rows)
+        stack = [0]
+        index = 0
+        token = tokens[0]
+        empty = 0
+        while True:
+            action = action_rows[stack[-1]][token]
+            if action > 0:
+                if action >= CONFLICT:
+                    return self.recognize_generalized(tokens, index, stack)
+                stack.append(action - 1)
+                index += 1
+                token = tokens[index]
+                empty = 0
+            elif action < 0:
+                rule = -action - 1
+                if rule == self.accept_rule:
+                    return True
+                length = rule_lengths[rule]
+                if length:
+                    del stack[-length:]
+                else:
+                    empty += 1
+                    if empty > limit:
+                        return self.recognize_generalized(tokens, index, stack)
+                stack.append(goto_rows[stack[-1]][rule_symbols[rule]])
+            else:
+                return False
+
+    # Function to go on recognizing the terminal ids from an index with a graph-structured stack, the states of the
+    # stack are the first nodes. In each position every head does its reduces, then the heads that accept the $ id
+    # accept the string and the heads that shift the terminal are the heads of the next position
+    def recognize_generalized(self, tokens, index: int, stack: list):
+        action_rows = self.action
+        goto_rows = self.goto
+        rule_lengths = self.rule_lengths
+        rule_symbols = self.rule_symbols
+        accept = -self.accept_rule - 1
+        node = None
+        for state in stack:
+            node = GSSNode(state, index, [node] if node is not None else [])
+        heads = {node.state: node}
+        limit = len(action_rows)
+        while True:
+            token = tokens[index]
+            # Reduce while there is a single head with a single reduce and a single path to reduce it, the heads are
+            # not merged here, so the reduces of the empty string are limited like in recognize
+            empty = 0
+            while len(heads) == 1 and not self.cyclic and empty <= limit:
+                head = next(iter(heads.values()))
+                action = action_rows[head.state][token]
+                if action >= 0 or action == accept:
+                    break
+                rule = -action - 1
+                if not rule_lengths[rule]:
+                    empty += 1
+                base = head
+                for _ in range(rule_lengths[rule]):
+                    if len(base.links) != 1:
+                        base = None
+                        break
+                    base = base.links[0]
+                if base is None:
+                    break
+                state = goto_rows[base.state][rule_symbols[rule]]
+                heads = {state: GSSNode(state, index, [base])}
+            self.reduce_heads(heads, token, index)
+            if token == 0:
+                return any(accept in self.cell_actions(head.state, 0) for head in heads.values())
+            next_heads = {}
+            for head in heads.values():
+                for action in self.cell_actions(head.state, token):
+                    if action > 0:
+                        next_head = next_heads.get(action - 1)
+                        if next_head is None:
+                            next_heads[action - 1] = GSSNode(action - 1, index + 1, [head])
+                        else:
+                            next_head.links.append(head)
+            if not next_heads:
                 return False
-            elif action == "accept":
+            heads = next_heads
+            index += 1
+
+    # Function to do every reduce of the heads of a position with a terminal, the new heads are added to the heads.
+    # When a reduce adds a link to a head that already existed, the reduces of every head are done again only
+    # through the new link, so no path is reduced twice
+    def reduce_heads(self, heads: dict, token: int, index: int):
+        goto_rows = self.goto
+        rule_lengths = self.rule_lengths
+        rule_symbols = self.rule_symbols
+        # Reduces to do, as (node, production, link) where the link is None or a link that the path must use
+        pending = [(head, rule, None) for head in heads.values() for rule in self.reduces(head.state, token)]
+        while pending:
+            node, rule, link = pending.pop()
+            symbol = rule_symbols[rule]
+            for base in gss_paths(node, rule_lengths[rule], link):
+                state = goto_rows[base.state][symbol]
+                head = heads.get(state)
+                if head is None:
+                    head = heads[state] = GSSNode(state, index, [base])
+                    pending.extend((head, new_rule, None) for new_rule in self.reduces(state, token))
+                elif all(below is not base for below in head.links):
+                    head.links.append(base)
+                    for other in heads.values():
+                        pending.extend((other, other_rule, (head, base))
+                                       for other_rule in self.reduces(other.state, token) if rule_lengths[other_rule])
+
+    # Function to parse a string building its parse tree, only if the grammar has no conflicts
+    def parse_tree(self, string: str, symbol_names: list):
+        self.check_deterministic()
+        return super().parse_tree(string, symbol_names)
+
+    # Function to recognize the terminal ids of a string counting its steps, with conflicts only the result is counted
+    def profile(self, tokens, stats):
+        if not self.conflicts:
+            return super().profile(tokens, stats)
+        accepted = self.recognize(tokens)
+        stats.add_parse(accepted, 0)
+        return accepted
+
+    # Function to create a push parser, only if the grammar has no conflicts
+    def push_parser(self):
+        self.check_deterministic()
+        return super().push_parser()
+
+    # Function to get the table compressed, only if the grammar has no conflicts
+    def compress(self):
+        self.check_deterministic()
+        return super().compress()
+
+    # Function to check that the table has no conflicts, the parse trees, the push parsers and the compressed tables
+    # need a single action in each cell
+    def check_deterministic(self):
+        if self.conflicts:
+            raise NotLR0Exception("The grammar has conflicts, the GLR table only recognizes strings")
+
+
+# Class with a node of the graph-structured stack, with its state, the position of the string where it was added and
+# the nodes below it in each branch
+class GSSNode:
+    def __init__(self, state: int, position: int, links: list):
+        self.state = state
+        self.position = position
+        self.links = links
+
+
+# Function to get the nodes at the end of the paths of a length from a node of the graph-structured stack, if a link
+# is given as (node, node below), only the paths that use it. The link starts in a head, so a path that reaches a
+# node of an older position without using it never will
+def gss_paths(node: GSSNode, length: int, link: tuple = None):
+    ends = {}
+    walk = [(node, length, link is None)]
+    while walk:
+        current, remaining, used = walk.pop()
+        if remaining == 0:
+            if used:
+                ends[id(current)] = current
+            continue
+        if not used and current.position != node.position:
+            continue
+        for below in current.links:
+            walk.append((below, remaining - 1, used or (current is link[0] and below is link[1])))
+    return list(ends.values())
+
+
+# Class with the compiled table of the bottom-up parser compressed with row displacement, the action and goto row
+# of each state are a single row, because the terminals and the non-terminals have different ids, and the rows are
+# packed into a single vector with the checks of their cells. The default reduction of each row is the cell of an
+# extra column, and only the cells with another action are packed, so the rows of the states that only reduce a
+# production have a single cell. The stack has the bases of the states instead of their numbers, so a shift or
+# a goto is the base of the next state, and an empty goto is never read, so it has no check. A goto to a state that
+# only reduces a unit production A -> B goes straight to the goto of A. It only recognizes strings
+class CompressedLRTable:
+    def __init__(self, table: LRTable):
+        self.symbol_ids = table.symbol_ids
+        self.lexer = table.lexer
+        symbols = max((len(row) for row in table.action), default=0)
+        # Column of the default action of each row
+        self.default_column = symbols
+        rows = []
+        goto_columns = set()
+        for action_row, goto_row in zip(table.action, table.unit_gotos()):
+            default = table.default_action(action_row)
+            cells = [(column, action) for column, action in enumerate(action_row) if action != default]
+            cells.append((symbols, default))
+            for column, target in enumerate(goto_row):
+                if target != -1:
+                    # The states are written plus 1, so they are not taken as empty cells
+                    cells.append((column, target + 1))
+                    goto_columns.add(column)
+            rows.append(cells)
+        self.bases, self.values, self.checks = pack_rows(rows, symbols + 1, 0)
+        # The states of the shifts and the gotos are replaced by their bases
+        bases = self.bases
+        values = self.values
+        for position, base in enumerate(self.checks):
+            column = position - base
+            if base != -1 and column != symbols and values[position] > 0:
+                values[position] = bases[values[position] - 1] + (column not in goto_columns)
+        self.rule_lengths = array("i", table.rule_lengths)
+        self.rule_symbols = array("i", table.rule_symbols)
+        self.accept_rule = table.accept_rule
+
+    # The input is translated like in the LRTable
+    translate = LRTable.translate
+
+    # Function to parse a string
+    def parse(self, string: str):
+        tokens = self.translate(string)
+        if tokens is None:
+            return False
+        return self.recognize(tokens)
+
+    # Function to recognize the terminal ids of a string ending with the $ id, it is the loop of LRTable.recognize
+    # with the bases of the states in the stack
+    def recognize(self, tokens):
+        values = self.values
+        checks = self.checks
+        default_column = self.default_column
+        rule_lengths = self.rule_lengths
+        rule_symbols = self.rule_symbols
+        # Base of the state of the top of the stack
+        base = self.bases[0]
+        stack = [base]
+        index = 0
+        token = tokens[0]
+        while True:
+            position = base + token
+            action = values[position] if checks[position] == base else values[base + default_column]
+            if action > 0:
+                base = action - 1
+                stack.append(base)
+                index += 1
+                token = tokens[index]
+            elif action < 0:
+                rule = -action - 1
+                if rule == self.accept_rule:
+                    return True
+                length = rule_lengths[rule]
+                if length:
+                    del stack[-length:]
+                base = values[stack[-1] + rule_symbols[rule]]
+                stack.append(base)
+            else:
+                return False
+
+    # Function to create a push parser that reads the string in chunks
+    def push_parser(self):
+        return CompressedLRPushParser(self)
+
+
+# Class to parse a string that is received in chunks with the LR table, the stack has the states of a viable prefix
+class LRPushParser(PushParser):
+    def __init__(self, table: LRTable):
+        super().__init__(table)
+        self.stack = [0]
+
+    # Function to apply the actions of a symbol until it is shifted, returns False if the symbol is not expected
+    def push(self, token: int):
+        table = self.table
+        action_rows = table.action
+        goto_rows = table.goto
+        rule_lengths = table.rule_lengths
+        rule_symbols = table.rule_symbols
+        stack = self.stack
+        while True:
+            action = action_rows[stack[-1]][token]
+            if action > 0:
+                stack.append(action - 1)
                 return True
+            elif action < 0:
+                rule = -action - 1
+                if rule == table.accept_rule:
+                    return True
+                length = rule_lengths[rule]
+                if length:
+                    del stack[-length:]
+                stack.append(goto_rows[stack[-1]][rule_symbols[rule]])
             else:
-                action_match = action_pattern.match(action)
-                # If the action is shift we add the state to the stack, and we move to the next symbol
-                if action_match.group("Action") == "shift":
-                    stack.append(int(action_match.group("state")))
-                    index += 1
-                # If the action is reduce we add the production to the stack
-                elif action_match.group("Action") == "reduce":
-                    # We remove the symbols from the stack
-                    for _ in range(self.production_length(action_match.group("production"))):
-                        stack.pop()
-                    # We add the state to the stack
-                    stack.append(self.table["Goto"][stack[-1]][action_match.group("non_terminal")])
+                return False
+
+
+# Class to parse a string that is received in chunks with the compressed LR table, the stack has bases of states
+class CompressedLRPushParser(LRPushParser):
+    def __init__(self, table: CompressedLRTable):
+        super().__init__(table)
+        self.stack = [table.bases[0]]
+
+    # Function to apply the actions of a symbol until it is shifted, returns False if the symbol is not expected
+    def push(self, token: int):
+        table = self.table
+        values = table.values
+        checks = table.checks
+        default_column = table.default_column
+        stack = self.stack
+        while True:
+            base = stack[-1]
+            position = base + token
+            action = values[position] if checks[position] == base else values[base + default_column]
+            if action > 0:
+                stack.append(action - 1)
+                return True
+            elif action < 0:
+                rule = -action - 1
+                if rule == table.accept_rule:
+                    return True
+                length = table.rule_lengths[rule]
+                if length:
+                    del stack[-length:]
+                stack.append(values[stack[-1] + table.rule_symbols[rule]])
+            else:
+                return False
@@ -1,8 +1,9 @@
 import re
 import os
 import time
-from grammar import Grammar, read_strings
+from grammar import Grammar, iter_strings
 from bottom_up_parser.bottom_up_parser import BottomUpParser
+from codegen import generate_module
 from exceptions import *
 
 
@@ -18,7 +19,14 @@ def test_closure():
     grammar.set_start("E")
     parser = BottomUpParser(grammar)
     # Print the first state, which is the closure of the start symbol
-    print(parser.states)
+    print(parser.state_to_dict(parser.states[0]))
+
+
+# Function to get the dictionary form of a state, or None if the state is empty
+def state_dict(parser: BottomUpParser, state: frozenset):
+    if state is None:
+        return None
+    return parser.state_to_dict(state)
 
 
 # Function to test the goto function
@@ -34,23 +42,23 @@ def test_goto():
     grammar.set_start("E")
     parser = BottomUpParser(grammar)
     # Print the first state, which is the closure of the start symbol
-    print(parser.states)
+    print(parser.state_to_dict(parser.states[0]))
     # Print the goto of the first state with the symbol E
-    print('GOTO of state 0 with symbol E: ', parser.goto(parser.states[0], 'E'))
+    print('GOTO of state 0 with symbol E: ', state_dict(parser, parser.goto(parser.states[0], 'E')))
     # Print the goto of the first state with the symbol T
-    print('GOTO of state 0 with symbol T: ', parser.goto(parser.states[0], 'T'))
+    print('GOTO of state 0 with symbol T: ', state_dict(parser, parser.goto(parser.states[0], 'T')))
     # Print the goto of the first state with the symbol F
-    print('GOTO of state 0 with symbol F: ', parser.goto(parser.states[0], 'F'))
+    print('GOTO of state 0 with symbol F: ', state_dict(parser, parser.goto(parser.states[0], 'F')))
     # Print the goto of the first state with the symbol i
-    print('GOTO of state 0 with symbol i: ', parser.goto(parser.states[0], 'i'))
+    print('GOTO of state 0 with symbol i: ', state_dict(parser, parser.goto(parser.states[0], 'i')))
     # Print the goto of the first state with the symbol +
-    print('GOTO of state 0 with symbol +: ', parser.goto(parser.states[0], '+'))
+    print('GOTO of state 0 with symbol +: ', state_dict(parser, parser.goto(parser.states[0], '+')))
     # Print the goto of the first state with the symbol *
-    print('GOTO of state 0 with symbol *: ', parser.goto(parser.states[0], '*'))
+    print('GOTO of state 0 with symbol *: ', state_dict(parser, parser.goto(parser.states[0], '*')))
     # Print the goto of the first state with the symbol (
-    print('GOTO of state 0 with symbol (: ', parser.goto(parser.states[0], '('))
+    print('GOTO of state 0 with symbol (: ', state_dict(parser, parser.goto(parser.states[0], '(')))
     # Print the goto of the first state with the symbol )
-    print('GOTO of state 0 with symbol ): ', parser.goto(parser.states[0], ')'))
+    print('GOTO of state 0 with symbol ): ', state_dict(parser, parser.goto(parser.states[0], ')')))
 
     # Create the grammar
     grammar = Grammar()
@@ -58,10 +66,12 @@ def test_goto():
     grammar.receive_production("S' -> S+S'|S*S'|ε")
     grammar.set_start("S")
     parser = BottomUpParser(grammar)
-    # Print the state 1
-    print(parser.states[1])
-    # Print the goto of the state 1 with the symbol S
-    print('GOTO of state 1 with symbol S: ', parser.goto(parser.states[1], 'S'))
+    # Print the state reached from the first state with the symbol a, the numbers of the states depend on the
+    # order they are built in
+    state = parser.goto(parser.states[0], 'a')
+    print(parser.state_to_dict(state))
+    # Print the goto of that state with the symbol S
+    print('GOTO of the state after a with symbol S: ', state_dict(parser, parser.goto(state, 'S')))
 
 
 # Function to test the states initialization
@@ -79,7 +89,7 @@ def test_states():
     parser.initialize_states()
     # Print the states
     for state in parser.states:
-        print(state)
+        print(parser.state_to_dict(state))
         print('----------------------------------------')
     print(len(parser.states))
 
@@ -95,7 +105,7 @@ def test_states():
     parser.initialize_states()
     # Print the states
     for state in parser.states:
-        print(state)
+        print(parser.state_to_dict(state))
         print('----------------------------------------')
     print(len(parser.states))
 
@@ -115,7 +125,7 @@ def test_action():
     parser.initialize_states()
     parser.initialize_table()
     # Print Action of state {E: [E.], E: [E.+T]}
-    index = parser.states.index({"E'": ['E.'], 'E': ['E.+T']})
+    index = parser.state_numbers[parser.state_from_dict({"E'": ['E.'], 'E': ['E.+T']})]
     print('ACTION of state {E: [E.], E: [E.+T]} with symbol : ', parser.table["Action"][index])
 
     # Create the grammar
@@ -125,10 +135,11 @@ def test_action():
     grammar.set_start("S")
     parser = BottomUpParser(grammar)
     # Print Action of state {S'': [S.]}
-    index = parser.states.index({"S''": ['S.']})
+    index = parser.state_numbers[parser.state_from_dict({"S''": ['S.']})]
     print('ACTION of state {S\'\': [S.]} with symbol : ', parser.table["Action"][index])
     # Print Action of state {S': [S+.S', .S+S', .S*S', .ε], S: [.aS']}
-    index = parser.states.index({"S'": ['S+.S\'', '.S+S\'', '.S*S\'', '.ε'], 'S': ['.aS\'']})
+    index = parser.state_numbers[parser.state_from_dict({"S'": ['S+.S\'', '.S+S\'', '.S*S\'', '.ε'],
+                                                         'S': ['.aS\'']})]
     print('ACTION of state {S\': [S+.S\', .S+S\', .S*S\', .ε], S: [.aS\']} with symbol : ',
           parser.table["Action"][index])
 
@@ -175,6 +186,229 @@ def test_parser():
     print(parser.parse("(i+i)*+i"))
 
 
+# Function to test the parse many function, reading the strings of a file as a stream
+def test_parse_many():
+    # Create the grammar
+    grammar = Grammar()
+    grammar.receive_production("E -> E+T")
+    grammar.receive_production("E -> T")
+    grammar.receive_production("T -> T*F")
+    grammar.receive_production("T -> F")
+    grammar.receive_production("F -> (E)")
+    grammar.receive_production("F -> i")
+    grammar.set_start("E")
+    parser = BottomUpParser(grammar)
+    # Parse every string of the file N.txt, should print True, True, True
+    path = os.path.join(os.path.dirname(__file__), "strings", "N.txt")
+    for string, accepted in zip(iter_strings(path), parser.parse_many(iter_strings(path))):
+        print(f'{string}: {accepted}')
+
+
+# Function to test the parse file function, the file is memory mapped and the results are a bitmap
+def test_parse_file():
+    # Create the grammar
+    grammar = Grammar()
+    grammar.receive_production("E -> E+T|T")
+    grammar.receive_production("T -> T*F|F")
+    grammar.receive_production("F -> (E)|i")
+    grammar.set_start("E")
+    parser = BottomUpParser(grammar)
+    # Parse every string of the file N.txt, should print 3 accepted strings of 3
+    results = parser.parse_file(os.path.join(os.path.dirname(__file__), "strings", "N.txt"))
+    print(f'{results.accepted()} accepted strings of {len(results)}')
+
+
+# Function to test the LALR(1) mode with a grammar that is not SLR
+def test_lalr():
+    # Create the grammar of the assignments, it has a conflict in the = column with the follow of R
+    grammar = Grammar()
+    grammar.receive_production("S -> L=R|R")
+    grammar.receive_production("L -> *R|i")
+    grammar.receive_production("R -> L")
+    grammar.set_start("S")
+    # The SLR table has a conflict, so it should print the conflict
+    try:
+        BottomUpParser(grammar)
+    except NotLR0Exception as e:
+        print(e)
+    # The LALR(1) table has no conflicts
+    parser = BottomUpParser(grammar, mode="lalr")
+    print(parser)
+    # Parse the strings i=*i and **i, should return True
+    print(parser.parse("i=*i"))
+    print(parser.parse("**i"))
+    # Parse the string i=, should return False
+    print(parser.parse("i="))
+
+
+# Function to test the update of the states and the table after adding a production to the grammar
+def test_update():
+    # Create the grammar
+    grammar = Grammar()
+    grammar.receive_production("E -> E+T|T")
+    grammar.receive_production("T -> T*F|F")
+    grammar.receive_production("F -> (E)|i")
+    grammar.set_start("E")
+    parser = BottomUpParser(grammar)
+    # Add the negative numbers, the states 12 and 13 should be added and only their rows and the rows with a shift
+    # of - should change
+    grammar.receive_production("F -> -F")
+    print(parser.update_sets())
+    # Parse the string -i*-(i), should return True
+    print(parser.parse("-i*-(i)"))
+
+
+# Test of the parse tree
+def test_parse_tree():
+    # Create the grammar
+    grammar = Grammar()
+    grammar.receive_production("E -> E+T|T")
+    grammar.receive_production("T -> T*F|F")
+    grammar.receive_production("F -> (E)|i")
+    grammar.set_start("E")
+    parser = BottomUpParser(grammar)
+    # Print the tree of the string i+i*(i)
+    tree = parser.parse_tree("i+i*(i)")
+    print(tree)
+    # Print the children of the root, should be E, + and T
+    print(tree.node().children())
+    # A string that is not accepted has no tree
+    print(parser.parse_tree("i+"))
+
+
+# Test of the push parser
+def test_push_parser():
+    # Create the grammar
+    grammar = Grammar()
+    grammar.receive_production("E -> E+T|T")
+    grammar.receive_production("T -> T*F|F")
+    grammar.receive_production("F -> (E)|i")
+    grammar.set_start("E")
+    parser = BottomUpParser(grammar)
+    # Read the string i+i*(i) in three chunks, should print True
+    push_parser = parser.push_parser()
+    for chunk in ["i+", "i*(", "i)"]:
+        push_parser.feed(chunk)
+    print(push_parser.finish())
+    # The string i+*i is rejected in the *, the chunks after it are not read, should print False and 2
+    push_parser = parser.push_parser()
+    print(push_parser.feed("i+*i"))
+    print(push_parser.position)
+
+
+# Test of the tokens of more than one character
+def test_tokens():
+    # Create a grammar with identifiers and numbers, the spaces are skipped
+    grammar = Grammar()
+    grammar.add_token("id", r"[a-z][a-z0-9]*", regex=True)
+    grammar.add_token("num", r"[0-9]+", regex=True)
+    grammar.add_ignored(r"\s+")
+    grammar.receive_production("E -> E+T|T")
+    grammar.receive_production("T -> T*F|F")
+    grammar.receive_production("F -> (E)|id|num")
+    grammar.set_start("E")
+    parser = BottomUpParser(grammar)
+    # Print the parsing result of the string x1 + 42 * (y), should be True
+    print(parser.parse("x1 + 42 * (y)"))
+    # Print the parsing result of the string x1 42, should be False
+    print(parser.parse("x1 42"))
+    # Print the tree of the string x1 + 42, the leaves are the tokens
+    print(parser.parse_tree("x1 + 42"))
+
+
+# Test of the compressed table
+def test_compressed_table():
+    # Create the grammar
+    grammar = Grammar()
+    grammar.receive_production("E -> E+T|T")
+    grammar.receive_production("T -> T*F|F")
+    grammar.receive_production("F -> (E)|i")
+    grammar.set_start("E")
+    parser = BottomUpParser(grammar)
+    table = parser.compressed_table()
+    # Print the size of the vector of the compressed table
+    print(len(table.values))
+    # Print the parsing result of the strings i+i*(i) and i+, should be True and False
+    print(table.parse("i+i*(i)"))
+    print(table.parse("i+"))
+
+
+# Test of the statistics of the phases and the parses
+def test_stats():
+    # Create the grammar
+    grammar = Grammar()
+    grammar.receive_production("E -> E+T|T")
+    grammar.receive_production("T -> T*F|F")
+    grammar.receive_production("F -> (E)|i")
+    grammar.set_start("E")
+    # The statistics are enabled before the states and the table are built, so their phases are timed
+    parser = BottomUpParser(grammar, profile=True)
+    parser.parse("i+i*(i)")
+    parser.parse("i+")
+    # Print the time of each phase, the steps of the parses and the hottest states and cells
+    print(parser.stats)
+
+
+# Test of the module generated for a grammar
+def test_generated_module():
+    # Create the grammar
+    grammar = Grammar()
+    grammar.receive_production("E -> E+T|T")
+    grammar.receive_production("T -> T*F|F")
+    grammar.receive_production("F -> (E)|i")
+    grammar.set_start("E")
+    parser = BottomUpParser(grammar, mode="lalr")
+    # The module doesn't need the project, so it can be run on its own
+    namespace = {}
+    exec(generate_module(parser), namespace)
+    # Print the parsing result of the strings i+i*(i) and i+, should be True and False
+    print(namespace["parse"]("i+i*(i)"))
+    print(namespace["parse"]("i+"))
+
+
+# Test of the GLR mode with an ambiguous grammar, it has conflicts in every mode
+def test_glr():
+    grammar = Grammar()
+    grammar.receive_production("E -> E+E|E*E|(E)|i")
+    grammar.set_start("E")
+    # The LALR(1) table has a conflict, so it should print the conflict
+    try:
+        BottomUpParser(grammar, mode="lalr")
+    except NotLR0Exception as e:
+        print(e)
+    # The GLR table keeps the conflicts and follows every action
+    parser = BottomUpParser(grammar, mode="glr")
+    print(f'Cells with conflicts: {len(parser.compiled_table().conflicts)}')
+    # Parse the strings i+i*i and (i+i)*i, should return True
+    print(parser.parse("i+i*i"))
+    print(parser.parse("(i+i)*i"))
+    # Parse the strings i+ and i)i, should return False
+    print(parser.parse("i+"))
+    print(parser.parse("i)i"))
+
+
+# Test of a grammar with a hidden left recursion, S -> BAb and B -> A'S with A' -> ε, the reduce of A' comes back
+# to the same state, so the cells that would reduce forever are errors and that reduce is not the default of the state
+def test_loops():
+    grammar = Grammar()
+    grammar.receive_production("S -> BAb")
+    grammar.receive_production("A -> cc|A'bA'")
+    grammar.receive_production("B -> A'S")
+    grammar.receive_production("C -> A|CA'")
+    grammar.receive_production("A' -> ε")
+    grammar.set_start("S")
+    parser = BottomUpParser(grammar)
+    # Print the cells that are errors, as (state, terminal id)
+    print(parser.compiled_table().loops)
+    # The language is empty, so every string should return False, with the table, the compressed table and the push
+    # parser
+    compressed = parser.compressed_table()
+    for string in ("b", "c", "", "ccb"):
+        push_parser = parser.push_parser()
+        push_parser.feed(string)
+        print(parser.parse(string), compressed.parse(string), push_parser.finish())
+
+
 # Function with the final test
 def test_final(grammar: Grammar = None, parser: BottomUpParser = None):
     if grammar is None:
@@ -355,7 +589,7 @@ def option_5(grammar: Grammar, parser: BottomUpParser):
             for derivation in derivations:
                 if derivation not in state[symbol]:
                     state[symbol].append(derivation)
-        print_closure(parser.closure(state))
+        print_closure(parser.state_to_dict(parser.closure(parser.state_from_dict(state))))
     except ValueError:
         print('Invalid option, the number of the production must be an integer greater than 0')
         time.sleep(1)
@@ -377,9 +611,12 @@ def option_6(grammar: Grammar, parser: BottomUpParser):
         symbol = input('Insert the symbol: ')
         if symbol not in grammar.terminals and symbol not in grammar.non_terminals:
             raise SymbolNotFoundException('Invalid symbol, it must be a terminal or a non-terminal')
-        index = parser.states.index(parser.goto(parser.states[state_number], symbol))
+        goto = parser.goto(parser.states[state_number], symbol)
+        if goto is None:
+            raise ValueError()
+        index = parser.state_numbers[goto]
         print('Goto of the state ' + str(state_number) + ' with the symbol ' + symbol + ': ' + str(index))
-        print(f'State {index}: {parser.states[index]}')
+        print(f'State {index}: {parser.state_to_dict(parser.states[index])}')
 
     except ValueError:
         print('Invalid option, the number of the state must be an integer between 0 and the number of states')
@@ -397,7 +634,7 @@ def option_9(grammar: Grammar, parser: BottomUpParser):
         action = input('Insert f to parse strings from a file or s to parse a string from console: ')
         if action == 'f':
             file_name = input('Insert the name of the file: ')
-            strings = read_strings(os.path.join(os.path.dirname(__file__), "strings", file_name))
+            strings = iter_strings(os.path.join(os.path.dirname(__file__), "strings", file_name))
             for string in strings:
                 check_parse_string(string, parser)
         elif action == 's':
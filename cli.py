@@ -0,0 +1,119 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+from corpus import CorpusResults
+from grammar import Grammar, iter_strings, read_grammars
+from top_down_parser.top_down_parser import TopDownParser
+from bottom_up_parser.bottom_up_parser import BottomUpParser
+
+# Kinds of parsers of the command line
+PARSERS = ("ll1", "slr", "lalr", "glr")
+
+
+# Function to build a parser of a grammar with a kind of parser, the start symbol is the first symbol of the
+# productions
+def build_parser(productions: list, kind: str, cache_dir: str = None, profile: bool = False):
+    grammar = Grammar()
+    for production in productions:
+        grammar.receive_production(production)
+    grammar.set_start(next(iter(grammar.productions)))
+    if kind == "ll1":
+        return TopDownParser(grammar, cache_dir, profile)
+    return BottomUpParser(grammar, cache_dir, kind, profile)
+
+
+# Function to find a grammar of a file by its number, starting from 1, or by its name, returns its productions
+def select_grammar(grammars: list, selected: str):
+    if selected.isdigit() and 1 <= int(selected) <= len(grammars):
+        return grammars[int(selected) - 1][1]
+    for name, productions in grammars:
+        if name == selected:
+            return productions
+    raise ValueError("Grammar {} is not in the file, there are {} grammars".format(selected, len(grammars)))
+
+
+# Function to parse a corpus, a file is memory mapped and "-" is the standard input, read a line at a time. With
+# statistics every string goes through the parser to count its steps
+def parse_input(parser, path: str):
+    if path == "-":
+        results = CorpusResults()
+        results.extend(bytes(parser.parse_many(line.strip() for line in sys.stdin)))
+        return results
+    if parser.stats is not None:
+        results = CorpusResults()
+        results.extend(bytes(parser.parse_many(iter_strings(path))))
+        return results
+    return parser.parse_file(path)
+
+
+# Function to parse every corpus and write the results and the statistics, returns the exit code
+def run(arguments, output):
+    grammars = read_grammars(arguments.grammars)
+    start = time.perf_counter()
+    parser = build_parser(select_grammar(grammars, arguments.grammar), arguments.parser, arguments.cache_dir,
+                          arguments.profile)
+    parser.compiled_table()
+    build_seconds = time.perf_counter() - start
+    report = {"grammars": arguments.grammars, "grammar": arguments.grammar, "parser": arguments.parser,
+              "build_seconds": build_seconds, "corpora": []}
+    for path in arguments.corpora:
+        start = time.perf_counter()
+        results = parse_input(parser, path)
+        seconds = time.perf_counter() - start
+        size = os.path.getsize(path) if path != "-" else None
+        corpus = {
+            "corpus": path,
+            "strings": len(results),
+            "accepted": results.accepted(),
+            "seconds": seconds,
+            "strings_per_second": len(results) / seconds if seconds else None,
+            "bytes_per_second": size / seconds if seconds and size is not None else None,
+        }
+        if not arguments.summary:
+            corpus["results"] = results.digits()
+        report["corpora"].append(corpus)
+        if not arguments.json:
+            if not arguments.summary:
+                output.write("".join(digit + "\n" for digit in corpus["results"]))
+            output.write("# {}: {} strings, {} accepted, {:.6f} s, {:.0f} strings/s\n".format(
+                path, corpus["strings"], corpus["accepted"], seconds, corpus["strings_per_second"] or 0))
+    if arguments.json:
+        json.dump(report, output, indent=2)
+        output.write("\n")
+    else:
+        output.write("# Table built or loaded in {:.6f} s\n".format(build_seconds))
+    if parser.stats is not None:
+        print(parser.stats, file=sys.stderr)
+    return 0
+
+
+# Function to read the arguments of the command line and run it, returns the exit code
+def main(argv: list = None):
+    argument_parser = argparse.ArgumentParser(description="Parse the strings of one or more files, a string in each "
+                                                          "line, with a grammar of a file")
+    argument_parser.add_argument("grammars", help="file with the grammars")
+    argument_parser.add_argument("corpora", nargs="+", help="files with the strings, - is the standard input")
+    argument_parser.add_argument("-g", "--grammar", default="1", help="number (from 1) or name of the grammar")
+    argument_parser.add_argument("-p", "--parser", choices=PARSERS, default="slr", help="kind of parser")
+    argument_parser.add_argument("-o", "--output", help="file of the results, the standard output by default")
+    argument_parser.add_argument("--json", action="store_true", help="write the results and statistics as JSON")
+    argument_parser.add_argument("--summary", action="store_true", help="write only the statistics of each file")
+    argument_parser.add_argument("--cache-dir", help="directory of the cached tables")
+    argument_parser.add_argument("--profile", action="store_true",
+                                 help="write the time of each phase and the steps of the parses to the standard error")
+    arguments = argument_parser.parse_args(argv)
+    try:
+        if arguments.output is None:
+            return run(arguments, sys.stdout)
+        with open(arguments.output, "w", encoding="utf-8") as output:
+            return run(arguments, output)
+    except Exception as exception:
+        print("Error: {}: {}".format(type(exception).__name__, exception), file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+import argparse
+import sys
+
+from cli import PARSERS, build_parser, select_grammar
+from grammar import read_grammars
+from lexer import IGNORED
+from top_down_parser.top_down_parser import LL1Table
+
+# Translated byte of the characters that are not a terminal in the generated modules
+INVALID = 255
+
+
+# Function to generate the source of a standalone Python module that recognizes the strings of the grammar of a
+# parser, the module only has the constants of its compiled table and the loops to read them, so it doesn't need
+# the rest of the project and it doesn't analyze the grammar when it is imported. It has the functions tokenize,
+# recognize and parse, like the compiled tables. A GLR table with conflicts can't be generated
+def generate_module(parser):
+    table = parser.compiled_table()
+    if getattr(table, "conflicts", None):
+        raise ValueError("The grammar has conflicts, only a deterministic table can be generated")
+    grammar = parser.grammar
+    lines = ["# Recognizer of the grammar generated by codegen.py, it doesn't need the rest of the project", "#"]
+    for non_terminal, derivations in grammar.productions.items():
+        lines.append("# " + non_terminal + " -> " + "|".join(derivation or "ε" for derivation in derivations))
+    lines.append("# Start symbol: " + grammar.start)
+    lines.append("")
+    if table.lexer is not None:
+        lines.extend(["from bisect import bisect_right", ""])
+    lines.append("# Ids of the terminals, $ is 0")
+    lines.append("TERMINALS = " + repr(dict(sorted(table.symbol_ids.items(), key=lambda item: item[1]))))
+    lines.extend(tokenizer_source(table))
+    if isinstance(table, LL1Table):
+        lines.extend(ll1_source(table))
+    else:
+        lines.extend(lr_source(table))
+    lines.extend([
+        "",
+        "",
+        "# Function to parse a string",
+        "def parse(string):",
+        "    tokens = tokenize(string)",
+        "    return tokens is not None and recognize(tokens)",
+        "",
+    ])
+    return "\n".join(lines)
+
+
+# Function to write the module of the grammar of a parser to a file
+def write_module(parser, path: str):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(generate_module(parser))
+
+
+# Function to get the byte that each character translates to, None if the terminals can't be translated byte by
+# byte, because a terminal is not ASCII or its id doesn't fit in a byte
+def translation_bytes(symbol_ids: dict):
+    translation = bytearray([INVALID]) * 256
+    for terminal, symbol in symbol_ids.items():
+        if len(terminal) != 1 or ord(terminal) >= 128 or symbol >= INVALID:
+            return None
+        translation[ord(terminal)] = symbol
+    return bytes(translation)
+
+
+# Function to generate the tokenize function of a table. With a lexer its DFA is copied, without it the string is
+# translated to terminal ids with bytes.translate when the terminals are ASCII, or with the terminals dictionary
+def tokenizer_source(table):
+    lexer = table.lexer
+    if lexer is not None:
+        return [
+            "",
+            "# DFA of the tokens, the class of each character, the next state of each state and class (-1 if there",
+            "# is none) and the terminal id accepted by each state (-1 if none, {} if it is ignored)".format(IGNORED),
+            "BOUNDS = " + repr(tuple(lexer.bounds)),
+            "CLASSES = " + repr(tuple(lexer.classes)),
+            "WIDTH = " + repr(lexer.width),
+            "TRANSITIONS = " + repr(tuple(lexer.transitions)),
+            "ACCEPTS = " + repr(tuple(lexer.accepts)),
+            "",
+            "",
+            "# Function to translate a string into its terminal ids ending with 0, the longest match is the token,",
+            "# returns None if a part of the string is not a token",
+            "def tokenize(string):",
+            "    transitions = TRANSITIONS",
+            "    accepts = ACCEPTS",
+            "    classes = CLASSES",
+            "    tokens = []",
+            "    length = len(string)",
+            "    position = 0",
+            "    while position < length:",
+            "        state = 0",
+            "        index = position",
+            "        token = -1",
+            "        end = position",
+            "        while index < length:",
+            "            code = ord(string[index])",
+            "            character_class = classes[code] if code < 256 else bisect_right(BOUNDS, code) - 1",
+            "            state = transitions[state * WIDTH + character_class]",
+            "            if state == -1:",
+            "                break",
+            "            index += 1",
+            "            if accepts[state] != -1:",
+            "                token = accepts[state]",
+            "                end = index",
+            "        if token == -1:",
+            "            return None",
+            "        if token != {}:".format(IGNORED),
+            "            tokens.append(token)",
+            "        position = end",
+            "    tokens.append(0)",
+            "    return tokens",
+        ]
+    translation = translation_bytes(table.symbol_ids)
+    if translation is None:
+        return [
+            "",
+            "",
+            "# Function to translate a string into its terminal ids ending with 0, returns None if a character is not",
+            "# a terminal",
+            "def tokenize(string):",
+            "    get = TERMINALS.get",
+            "    tokens = [get(character, -1) for character in string]",
+            "    if -1 in tokens:",
+            "        return None",
+            "    tokens.append(0)",
+            "    return tokens",
+        ]
+    return [
+        "",
+        "# Terminal id of each ASCII character, {} if it is not a terminal".format(INVALID),
+        "TRANSLATION = " + repr(translation),
+        "",
+        "",
+        "# Function to translate a string into the bytes of its terminal ids ending with 0, returns None if a",
+        "# character is not a terminal",
+        "def tokenize(string):",
+        "    try:",
+        "        tokens = string.encode(\"ascii\").translate(TRANSLATION)",
+        "    except UnicodeEncodeError:",
+        "        return None",
+        "    if {!r} in tokens:".format(bytes([INVALID])),
+        "        return None",
+        "    return tokens + b\"\\0\"",
+    ]
+
+
+# Function to generate the recognize function of a LL(1) table, the rows are tuples indexed by symbol id, None for
+# the terminals, and each cell has the derivation reversed, in the order it is pushed to the stack
+def ll1_source(table: LL1Table):
+    rows = tuple(None if row is None else tuple(row) for row in table.rows)
+    return [
+        "",
+        "",
+        "# Row of each symbol id, None for the terminals, and the derivation of each cell reversed",
+        "ROWS = " + repr(rows),
+        "",
+        "",
+        "# Function to recognize the terminal ids of a string ending with 0",
+        "def recognize(tokens):",
+        "    rows = ROWS",
+        "    stack = [0, {}]".format(table.start),
+        "    pop = stack.pop",
+        "    extend = stack.extend",
+        "    index = 0",
+        "    token = tokens[0]",
+        "    while stack:",
+        "        top = pop()",
+        "        row = rows[top]",
+        "        if row is None:",
+        "            if top != token:",
+        "                return False",
+        "            if token == 0:",
+        "                return True",
+        "            index += 1",
+        "            token = tokens[index]",
+        "        else:",
+        "            symbols = row[token]",
+        "            if symbols is None:",
+        "                return False",
+        "            extend(symbols)",
+        "    return True",
+    ]
+
+
+# Function to generate the recognize function of a LR table, the accept is inlined, the length and the symbol of
+# each production are indexed by the reduce action, so the production number is never computed, and the gotos skip
+# the states that only reduce a unit production
+def lr_source(table):
+    action = tuple(tuple(row) for row in table.action)
+    goto = tuple(tuple(row) for row in table.unit_gotos())
+    return [
+        "",
+        "",
+        "# Action of each state and terminal id, 0 is an error, state + 1 a shift and -(production + 1) a reduce",
+        "ACTION = " + repr(action),
+        "# Next state of each state and non-terminal id, -1 if there is none",
+        "GOTO = " + repr(goto),
+        "# Length and non-terminal id of each production, indexed by -action",
+        "LENGTHS = " + repr((0,) + tuple(table.rule_lengths)),
+        "SYMBOLS = " + repr((-1,) + tuple(table.rule_symbols)),
+        "",
+        "",
+        "# Function to recognize the terminal ids of a string ending with 0",
+        "def recognize(tokens):",
+        "    action_rows = ACTION",
+        "    goto_rows = GOTO",
+        "    lengths = LENGTHS",
+        "    symbols = SYMBOLS",
+        "    stack = [0]",
+        "    push = stack.append",
+        "    state = 0",
+        "    index = 0",
+        "    token = tokens[0]",
+        "    while True:",
+        "        action = action_rows[state][token]",
+        "        if action > 0:",
+        "            state = action - 1",
+        "            push(state)",
+        "            index += 1",
+        "            token = tokens[index]",
+        "        elif action < 0:",
+        "            if action == {}:".format(-table.accept_rule - 1),
+        "                return True",
+        "            length = lengths[-action]",
+        "            if length:",
+        "                del stack[-length:]",
+        "            state = goto_rows[stack[-1]][symbols[-action]]",
+        "            push(state)",
+        "        else:",
+        "            return False",
+    ]
+
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(description="Generate a standalone Python module that recognizes the "
+                                                          "strings of a grammar of a file")
+    argument_parser.add_argument("grammars", help="file with the grammars")
+    argument_parser.add_argument("-g", "--grammar", default="1", help="number (from 1) or name of the grammar")
+    argument_parser.add_argument("-p", "--parser", choices=PARSERS, default="slr", help="kind of parser")
+    argument_parser.add_argument("-o", "--output", help="file of the module, the standard output by default")
+    arguments = argument_parser.parse_args()
+    try:
+        grammar_parser = build_parser(select_grammar(read_grammars(arguments.grammars), arguments.grammar),
+                                      arguments.parser)
+        if arguments.output is None:
+            sys.stdout.write(generate_module(grammar_parser))
+        else:
+            write_module(grammar_parser, arguments.output)
+    except Exception as exception:
+        print("Error: {}: {}".format(type(exception).__name__, exception), file=sys.stderr)
+        sys.exit(1)
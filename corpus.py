@@ -0,0 +1,153 @@
+import mmap
+import os
+
+# Size of the blocks of the file translated at once, a block always ends at the end of a line
+BLOCK_SIZE = 1 << 20
+# Translated byte of the bytes that are not a terminal
+INVALID = 255
+# Bytes removed from the ends of each line, the ASCII characters removed by str.strip
+WHITESPACE = frozenset(b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f")
+# Translation of the results 0 and 1 to binary digits
+BIT_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+# Class with the result of each line of a corpus in a bitmap, the bit of a line is 1 if the line is accepted
+class CorpusResults:
+    def __init__(self):
+        self.bits = bytearray()
+        self.count = 0
+
+    # Function to add the result of the next line
+    def append(self, accepted: bool):
+        if self.count % 8 == 0:
+            self.bits.append(0)
+        if accepted:
+            self.bits[-1] |= 1 << (self.count % 8)
+        self.count += 1
+
+    # Function to add the results of many lines, a byte 0 or 1 for each line. After the last byte of the bitmap is
+    # filled, the results are read as the binary digits of an integer, with the first line in the lowest bit
+    def extend(self, flags: bytes):
+        index = 0
+        while self.count % 8 and index < len(flags):
+            self.append(flags[index])
+            index += 1
+        rest = flags[index:]
+        if rest:
+            bits = int(bytes(rest).translate(BIT_DIGITS)[::-1], 2)
+            self.bits.extend(bits.to_bytes((len(rest) + 7) // 8, "little"))
+            self.count += len(rest)
+
+    # Function to get the number of lines
+    def __len__(self):
+        return self.count
+
+    # Function to know if a line is accepted
+    def __getitem__(self, index: int):
+        if not 0 <= index < self.count:
+            raise IndexError("Line {} is not in the results".format(index))
+        return bool(self.bits[index // 8] >> (index % 8) & 1)
+
+    # Function to get the number of accepted lines
+    def accepted(self):
+        return bin(int.from_bytes(self.bits, "little")).count("1")
+
+    # Function to get the results as the digits 1 and 0, a character for each line in order
+    def digits(self):
+        if not self.count:
+            return ""
+        return format(int.from_bytes(self.bits, "little"), "0{}b".format(self.count))[::-1]
+
+    # Function to get the numbers of the rejected lines, starting from 0
+    def rejected_lines(self):
+        return (index for index in range(self.count) if not self.bits[index // 8] >> (index % 8) & 1)
+
+
+# Function to get the table that translates the bytes of a line into terminal ids, the new line is the $ id and the
+# other bytes that are not a terminal are INVALID. Returns None if the terminals can't be read byte by byte, because
+# the grammar has a lexer, a terminal is not ASCII or an id doesn't fit in a byte
+def byte_table(table):
+    if table.lexer is not None:
+        return None
+    translation = bytearray([INVALID]) * 256
+    translation[ord("\n")] = 0
+    for terminal, symbol in table.symbol_ids.items():
+        if len(terminal) != 1 or ord(terminal) >= 128 or symbol >= INVALID:
+            return None
+        translation[ord(terminal)] = symbol
+    return bytes(translation)
+
+
+# Function to parse every line of a file with a compiled table, the lines end only with the new line and are
+# stripped like in iter_strings.
+# The file is memory mapped and translated in blocks, each line is recognized from a slice of its block without
+# copying it, so the memory used doesn't depend on the size of the file. Returns the results in a bitmap
+def parse_corpus(table, path: str):
+    results = CorpusResults()
+    translation = byte_table(table)
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return results
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            size = len(data)
+            block_start = 0
+            while block_start < size:
+                # The block ends after the last new line before the block size, or after the first one if the line
+                # is longer than a block
+                block_end = data.rfind(b"\n", block_start, block_start + BLOCK_SIZE) + 1
+                if block_end <= block_start:
+                    block_end = data.find(b"\n", block_start) + 1 or size
+                block = data[block_start:block_end]
+                if translation is None:
+                    lines = block.split(b"\n")
+                    # The new line at the end of the block doesn't start another line
+                    if block.endswith(b"\n"):
+                        lines.pop()
+                    results.extend(bytes(parse_text_line(table, line) for line in lines))
+                else:
+                    parse_block(table, block, block.translate(translation), results)
+                block_start = block_end
+    return results
+
+
+# Function to parse a line that can't be read byte by byte, a line that is not valid UTF-8 is rejected
+def parse_text_line(table, line: bytes):
+    try:
+        string = line.decode("utf-8")
+    except UnicodeDecodeError:
+        return False
+    return table.parse(string.strip())
+
+
+# Function to recognize the lines of a block with the translated block, each line is a view of the translated block
+# that ends with the $ id of its new line, only a line without new line or with spaces at the end is copied.
+# A line with a byte that is not a terminal is decoded and stripped like in iter_strings, it could end with
+# whitespace that is not ASCII
+def parse_block(table, block: bytes, translated: bytes, results: CorpusResults):
+    recognize = table.recognize
+    # Result of each line of the block
+    flags = bytearray()
+    append = flags.append
+    view = memoryview(translated)
+    find = block.find
+    invalid = translated.find
+    invalid_byte = bytes([INVALID])
+    length = len(block)
+    start = 0
+    while start < length:
+        line_end = find(b"\n", start)
+        if line_end == -1:
+            line_end = length
+        end = line_end
+        while start < end and block[start] in WHITESPACE:
+            start += 1
+        while end > start and block[end - 1] in WHITESPACE:
+            end -= 1
+        if invalid(invalid_byte, start, end) != -1:
+            append(parse_text_line(table, block[start:end]))
+        elif end == line_end < length:
+            append(recognize(view[start:end + 1]))
+        else:
+            append(recognize(translated[start:end] + b"\0"))
+        start = line_end + 1
+    results.extend(flags)
@@ -51,3 +51,11 @@ class InvalidNonTerminalException(Exception):
     def __init__(self, message):
         self.message = message
         super().__init__(self.message)
+
+
+# Exception raised when a token of the lexer is not valid
+class InvalidTokenException(Exception):
+
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
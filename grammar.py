@@ -10,24 +10,57 @@ class Grammar:
         self.start = None
         self.non_terminals = set()
         self.terminals = set()
+        # Counter increased every time the grammar changes, so the parsers know when their cached sets are stale
+        self.version = 0
+        # Compiled form of the grammar, every symbol is interned as an integer id, the id 0 is the end marker $
+        self.symbols = ["$"]
+        self.symbol_ids = {"$": 0}
+        self.non_terminal_ids = set()
+        self.terminal_ids = set()
+        # Numbered productions as (symbol id, tuple of derivation symbol ids), a deleted production leaves None
+        # in its place, so the numbers of the other productions never change
+        self.rules = []
+        # Number of each production, by symbol and derivation, in the same order as the productions
+        self.rule_ids = {}
+        # Terminals of more than one character, from the name used in the productions to its pattern and if the
+        # pattern is a regular expression, and the patterns skipped by the lexer between the tokens
+        self.tokens = {}
+        self.ignored = []
+        # Pattern to split the derivations, the tokens are matched before the single characters
+        self.symbol_pattern = symbol_pattern
+
+    # Method to get the id of a symbol, interning it if it is new
+    def intern(self, symbol: str):
+        if symbol not in self.symbol_ids:
+            self.symbol_ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return self.symbol_ids[symbol]
 
     # Method to add a production to the grammar
     def add_production(self, symbol: str, derivation: str):
         # If the symbol is not in the productions, it is new, so we add it
         if symbol not in self.productions:
             self.productions[symbol] = []
+            self.rule_ids[symbol] = {}
         # We add the derivation to the symbol, if it is not already in the productions
-        if derivation not in self.productions[symbol]:
+        if derivation not in self.rule_ids[symbol]:
             self.productions[symbol].append(derivation)
+            # Number the production and store its derivation as a tuple of symbol ids
+            self.rule_ids[symbol][derivation] = len(self.rules)
+            self.rules.append((self.intern(symbol), tuple(self.intern(element)
+                                                          for element in self.split(derivation))))
+            self.version += 1
 
     # Method to delete a production from the grammar
     def delete_production(self, symbol: str, derivation: str):
         # If the symbol is not in the productions or the derivation is not in the productions of the symbol,
         # it is not in the grammar, so we return None
-        if symbol not in self.productions or derivation not in self.productions[symbol]:
+        if symbol not in self.rule_ids or derivation not in self.rule_ids[symbol]:
             return None
         # We remove the derivation from the symbol
         self.productions[symbol].remove(derivation)
+        self.rules[self.rule_ids[symbol].pop(derivation)] = None
+        self.version += 1
 
     # Method to delete a production, receiving the production as a string
     def delete_production_str(self, production: str):
@@ -79,25 +112,22 @@ class Grammar:
         for derivation in derivations:
             self.add_production(symbol, derivation)
 
-            # We create a pattern to match the non-terminals in the derivation
-            pattern = re.compile(r'([A-Z]\'*)')
-            # We match the derivation with the pattern, adding the non-terminals to the grammar
-            # and removing them from the derivation
-            for _ in pattern.finditer(derivation):
-                element = pattern.search(derivation)
-                self.add_non_terminal(element.group(1))
-                derivation = derivation[:element.start()] + derivation[element.end():]
-
-            # For each element in the derivation, we check if it is a non-terminal or a terminal,
+            # For each symbol in the derivation, we check if it is a non-terminal or a terminal,
             # and we add it to the corresponding set
-            for element in range(len(derivation)):
-                self.add_terminal(derivation[element])
+            for element in self.split(derivation):
+                if element not in self.tokens and "A" <= element[0] <= "Z":
+                    self.add_non_terminal(element)
+                else:
+                    self.add_terminal(element)
 
     # Method to add a non-terminal to the grammar, it does not matter if it is already in the grammar
     # the set does not allow duplicates
     def add_non_terminal(self, non_terminal: str):
         if re.match(r'[A-Z]\'*', non_terminal):
-            self.non_terminals.add(non_terminal)
+            if non_terminal not in self.non_terminals:
+                self.non_terminals.add(non_terminal)
+                self.non_terminal_ids.add(self.intern(non_terminal))
+                self.version += 1
         else:
             raise InvalidNonTerminalException(
                 "Non-terminal must be an uppercase letter followed by 0 or more apostrophes")
@@ -105,8 +135,37 @@ class Grammar:
     # Method to add a terminal to the grammar, it does not matter if it is already in the grammar
     # the set does not allow duplicates
     def add_terminal(self, terminal: str):
-        if terminal != 'ε':
+        if terminal != 'ε' and terminal not in self.terminals:
             self.terminals.add(terminal)
+            self.terminal_ids.add(self.intern(terminal))
+            self.version += 1
+
+    # Method to add a token, a terminal of one or more characters. The name is used in the productions and the
+    # pattern is the text matched by the lexer, the name itself if it is None, or a regular expression if regex is
+    # True. The tokens must be added before the productions that use them
+    def add_token(self, name: str, pattern: str = None, regex: bool = False):
+        if not name or name == 'ε' or any(character in name for character in "| "):
+            raise InvalidTokenException("Invalid token name: {}".format(name))
+        self.tokens[name] = (name if pattern is None else pattern, regex)
+        self.symbol_pattern = re.compile("|".join(re.escape(token) for token in sorted(self.tokens, key=len,
+                                                                                      reverse=True)) +
+                                         "|" + symbol_pattern.pattern)
+        self.version += 1
+
+    # Method to add a regular expression that the lexer skips between the tokens, like spaces or comments
+    def add_ignored(self, pattern: str):
+        self.ignored.append(pattern)
+        self.version += 1
+
+    # Method to split a derivation into its symbols, the tokens are a single symbol
+    def split(self, derivation: str):
+        return split_derivation(derivation, self.symbol_pattern)
+
+    # Method to get the tokens of the lexer as (symbol id, pattern, is regex), every terminal that is not a token
+    # is a literal of one character
+    def lexer_tokens(self):
+        return [(self.symbol_ids[terminal],) + self.tokens.get(terminal, (terminal, False))
+                for terminal in sorted(self.terminals, key=self.symbol_ids.get)]
 
     # Method to set the start symbol of the grammar
     def set_start(self, start: str):
@@ -114,7 +173,9 @@ class Grammar:
         if start not in self.non_terminals:
             raise SymbolNotFoundException("Start symbol must be a non-terminal, which is in the grammar")
         # We set the start symbol
-        self.start = start
+        if start != self.start:
+            self.start = start
+            self.version += 1
 
     # Method to print the productions of the grammar in case we want to print the grammar
     def __str__(self):
@@ -132,10 +193,48 @@ class Grammar:
         return grammar_str
 
 
+# Pattern to match the symbols of a derivation, a non-terminal (A, A', A'') or any other character
+symbol_pattern = re.compile(r"[A-Z]'*|.")
+
+
+# Function to split a derivation into its symbols, a non-terminal with its apostrophes is a single symbol
+# and epsilon is removed, because it is the empty string
+def split_derivation(derivation: str, pattern=symbol_pattern):
+    return [symbol for symbol in pattern.findall(derivation) if symbol != 'ε']
+
+
 # Function to read strings from a file and return them as a list
 def read_strings(path: str):
-    strings = []
-    with open(path, "r") as file:
+    return list(iter_strings(path))
+
+
+# Function to read strings from a file one line at a time, so files of any size can be parsed without
+# loading them in memory. Only the new line ends a line, like in parse_corpus, and the bytes that are not UTF-8
+# are replaced by a character that is never a terminal, so their lines are rejected
+def iter_strings(path: str):
+    with open(path, "r", encoding="utf-8", errors="replace", newline="\n") as file:
+        for line in file:
+            yield line.strip()
+
+
+# Function to read the grammars of a file, returns a list of (name, productions) tuples. The grammars are separated
+# by blank lines or lines of dashes, any other line without an arrow is the name of the next grammars
+def read_grammars(path: str):
+    grammars = []
+    name = None
+    productions = []
+    with open(path, "r", encoding="utf-8") as file:
         for line in file:
-            strings.append(line.strip())
-    return strings
+            line = line.strip()
+            if "->" in line:
+                productions.append(line)
+                continue
+            # The grammar ends with the first line that is not a production
+            if productions:
+                grammars.append((name, productions))
+                productions = []
+            if line and not line.startswith("-"):
+                name = line
+    if productions:
+        grammars.append((name, productions))
+    return grammars
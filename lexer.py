@@ -0,0 +1,364 @@
+from bisect import bisect_right
+from exceptions import InvalidTokenException
+
+# Largest code point of a character
+MAX_CHARACTER = 0x10FFFF
+# Accept value of the states that end an ignored pattern, like spaces or comments
+IGNORED = -2
+# Ranges of the characters of the escapes of the patterns
+ESCAPE_RANGES = {
+    "d": [(48, 57)],
+    "w": [(48, 57), (65, 90), (95, 95), (97, 122)],
+    "s": [(9, 13), (32, 32)],
+}
+ESCAPE_CHARACTERS = {"n": "\n", "t": "\t", "r": "\r", "f": "\f", "v": "\v", "0": "\0"}
+
+
+# Class to split a string into the terminal ids of a grammar. Every terminal is a literal or a regular expression,
+# all of them are compiled into a single DFA that reads each character once and keeps the longest match, if two
+# terminals match the same text the literals win over the regular expressions, and then the first one declared
+class Lexer:
+    def __init__(self, tokens: list, ignored: list = ()):
+        # Regular expressions and literals are compiled to a NFA, each token as (symbol id, pattern, is regex)
+        nfa = NFA()
+        start = nfa.add_state()
+        # Accept value and priority of the final state of each token, the lowest priority wins
+        finals = {}
+        ordered = sorted(range(len(tokens)), key=lambda index: (tokens[index][2], index))
+        for priority, index in enumerate(ordered):
+            symbol, pattern, regex = tokens[index]
+            tree = parse_regex(pattern) if regex else ("cat", [("set", [(ord(c), ord(c))]) for c in pattern])
+            fragment_start, fragment_end = nfa.compile(tree)
+            nfa.epsilon[start].append(fragment_start)
+            finals[fragment_end] = (priority, symbol)
+        for index, pattern in enumerate(ignored):
+            fragment_start, fragment_end = nfa.compile(parse_regex(pattern))
+            nfa.epsilon[start].append(fragment_start)
+            finals[fragment_end] = (len(tokens) + index, IGNORED)
+
+        # The characters are split into classes, two characters of the same class have the same transitions
+        bounds = {0}
+        for edges in nfa.edges:
+            for ranges, _ in edges:
+                for low, high in ranges:
+                    bounds.add(low)
+                    bounds.add(high + 1)
+        bounds.discard(MAX_CHARACTER + 1)
+        self.bounds = sorted(bounds)
+        self.width = len(self.bounds)
+        # Class of the first 256 characters, the other ones are searched in the bounds
+        self.classes = [self.char_class(code) for code in range(256)]
+        edge_classes = [[(self.range_classes(ranges), target) for ranges, target in edges] for edges in nfa.edges]
+
+        # Subset construction, a state of the DFA is the set of states of the NFA that can be reached
+        initial = nfa.closure({start})
+        if not finals.keys().isdisjoint(initial):
+            raise InvalidTokenException("A token can't match the empty string")
+        states = [initial]
+        numbers = {initial: 0}
+        # Next state of each state and class in a single list, -1 if there is no transition
+        self.transitions = []
+        # Symbol id of the token accepted by each state, -1 if the state does not accept a token
+        self.accepts = []
+        number = 0
+        while number < len(states):
+            state = states[number]
+            targets = {}
+            for nfa_state in state:
+                for classes, target in edge_classes[nfa_state]:
+                    for character_class in classes:
+                        targets.setdefault(character_class, set()).add(target)
+            row = [-1] * self.width
+            for character_class, target in targets.items():
+                target = nfa.closure(target)
+                if target not in numbers:
+                    numbers[target] = len(states)
+                    states.append(target)
+                row[character_class] = numbers[target]
+            self.transitions.extend(row)
+            accepted = min((finals[nfa_state] for nfa_state in state if nfa_state in finals), default=None)
+            self.accepts.append(-1 if accepted is None else accepted[1])
+            number += 1
+        # States with a transition, a match that ends in one of them could go on with more characters
+        self.alive = [any(next_state != -1 for next_state in self.transitions[index * self.width:
+                                                                             (index + 1) * self.width])
+                      for index in range(len(states))]
+
+    # Function to get the class of a character code
+    def char_class(self, code: int):
+        return bisect_right(self.bounds, code) - 1
+
+    # Function to get the classes of the characters of a list of ranges
+    def range_classes(self, ranges: list):
+        classes = []
+        for low, high in ranges:
+            classes.extend(range(self.char_class(low), self.char_class(high) + 1))
+        return classes
+
+    # Function to read the tokens of a string, the symbol ids are added to tokens and the position where each token
+    # starts and ends to starts and ends. Returns the position where it stopped and if there was an error, if final
+    # is False the last token is not read when a longer match could continue in the next string
+    def scan(self, string: str, tokens: list, starts: list = None, ends: list = None, final: bool = True):
+        transitions = self.transitions
+        accepts = self.accepts
+        classes = self.classes
+        width = self.width
+        length = len(string)
+        position = 0
+        while position < length:
+            state = 0
+            index = position
+            token = -1
+            end = position
+            # Longest match from the position, the last accepting state is the token
+            while index < length:
+                code = ord(string[index])
+                state = transitions[state * width + (classes[code] if code < 256 else self.char_class(code))]
+                if state == -1:
+                    break
+                index += 1
+                if accepts[state] != -1:
+                    token = accepts[state]
+                    end = index
+            if not final and index == length and state != -1 and self.alive[state]:
+                break
+            if token == -1:
+                return position, True
+            if token != IGNORED:
+                tokens.append(token)
+                if starts is not None:
+                    starts.append(position)
+                    ends.append(end)
+            position = end
+        return position, False
+
+    # Function to translate a string into the list of its terminal ids ending with the $ id,
+    # returns None if a part of the string is not a token
+    def tokenize(self, string: str, starts: list = None, ends: list = None):
+        tokens = []
+        if self.scan(string, tokens, starts, ends)[1]:
+            return None
+        tokens.append(0)
+        if starts is not None:
+            starts.append(len(string))
+            ends.append(len(string))
+        return tokens
+
+
+# Class with a NFA built with the construction of Thompson, every state has its epsilon transitions and its
+# transitions with ranges of characters
+class NFA:
+    def __init__(self):
+        self.epsilon = []
+        self.edges = []
+
+    # Function to add a state, returns its number
+    def add_state(self):
+        self.epsilon.append([])
+        self.edges.append([])
+        return len(self.epsilon) - 1
+
+    # Function to add the states of a regular expression tree, returns its start and final states
+    def compile(self, tree: tuple):
+        kind = tree[0]
+        start = self.add_state()
+        if kind == "set":
+            end = self.add_state()
+            self.edges[start].append((tree[1], end))
+        elif kind == "cat":
+            end = start
+            for child in tree[1]:
+                child_start, child_end = self.compile(child)
+                self.epsilon[end].append(child_start)
+                end = child_end
+        elif kind == "alt":
+            end = self.add_state()
+            for child in tree[1]:
+                child_start, child_end = self.compile(child)
+                self.epsilon[start].append(child_start)
+                self.epsilon[child_end].append(end)
+        else:
+            # Repetition, the minimum copies are required, then the optional ones or a loop if there is no maximum
+            _, child, minimum, maximum = tree
+            end = start
+            for _ in range(minimum):
+                child_start, child_end = self.compile(child)
+                self.epsilon[end].append(child_start)
+                end = child_end
+            if maximum is None:
+                child_start, child_end = self.compile(child)
+                self.epsilon[end].append(child_start)
+                self.epsilon[child_end].append(end)
+            else:
+                exit_state = self.add_state()
+                self.epsilon[end].append(exit_state)
+                for _ in range(maximum - minimum):
+                    child_start, child_end = self.compile(child)
+                    self.epsilon[end].append(child_start)
+                    self.epsilon[child_end].append(exit_state)
+                    end = child_end
+                end = exit_state
+        return start, end
+
+    # Function to get the states reached from a set of states with epsilon transitions
+    def closure(self, states: set):
+        closure = set(states)
+        pending = list(states)
+        while pending:
+            for target in self.epsilon[pending.pop()]:
+                if target not in closure:
+                    closure.add(target)
+                    pending.append(target)
+        return frozenset(closure)
+
+
+# Function to parse a regular expression into a tree of tuples, ("set", ranges) for a character or a class,
+# ("cat", children), ("alt", children) and ("repeat", child, minimum, maximum) with None for no maximum.
+# It supports |, (), (?:), *, +, ?, {m}, {m,}, {m,n}, ., [] classes and the escapes \d \w \s \D \W \S
+def parse_regex(pattern: str):
+    tree, index = parse_alternation(pattern, 0)
+    if index != len(pattern):
+        raise InvalidTokenException("Invalid regular expression: {}, unbalanced parenthesis".format(pattern))
+    return tree
+
+
+# Function to parse the alternatives of a regular expression from an index, returns the tree and the next index
+def parse_alternation(pattern: str, index: int):
+    alternatives = []
+    while True:
+        sequence, index = parse_sequence(pattern, index)
+        alternatives.append(sequence)
+        if index < len(pattern) and pattern[index] == "|":
+            index += 1
+        else:
+            break
+    return (alternatives[0] if len(alternatives) == 1 else ("alt", alternatives)), index
+
+
+# Function to parse a sequence of repeated atoms of a regular expression, returns the tree and the next index
+def parse_sequence(pattern: str, index: int):
+    items = []
+    while index < len(pattern) and pattern[index] not in "|)":
+        atom, index = parse_atom(pattern, index)
+        while index < len(pattern) and pattern[index] in "*+?{":
+            character = pattern[index]
+            if character == "{":
+                close = pattern.find("}", index)
+                bounds = pattern[index + 1:close].split(",") if close != -1 else []
+                if not 1 <= len(bounds) <= 2 or not all(bound.strip().isdigit() for bound in bounds if bound) or \
+                        not bounds[0].strip():
+                    raise InvalidTokenException("Invalid repetition in the regular expression: {}".format(pattern))
+                minimum = int(bounds[0])
+                maximum = minimum if len(bounds) == 1 else (int(bounds[1]) if bounds[1].strip() else None)
+                if maximum is not None and maximum < minimum:
+                    raise InvalidTokenException("Invalid repetition in the regular expression: {}".format(pattern))
+                index = close + 1
+            else:
+                minimum, maximum = {"*": (0, None), "+": (1, None), "?": (0, 1)}[character]
+                index += 1
+            atom = ("repeat", atom, minimum, maximum)
+        items.append(atom)
+    return ("cat", items), index
+
+
+# Function to parse a character, a class or a group of a regular expression, returns the tree and the next index
+def parse_atom(pattern: str, index: int):
+    character = pattern[index]
+    if character == "(":
+        index += 1
+        if pattern.startswith("?:", index):
+            index += 2
+        tree, index = parse_alternation(pattern, index)
+        if index >= len(pattern) or pattern[index] != ")":
+            raise InvalidTokenException("Invalid regular expression: {}, unbalanced parenthesis".format(pattern))
+        return tree, index + 1
+    if character == "[":
+        return parse_class(pattern, index + 1)
+    if character == ".":
+        return ("set", complement([(10, 10)])), index + 1
+    if character == "\\":
+        ranges, index = parse_escape(pattern, index + 1)
+        return ("set", ranges), index
+    if character in "*+?{":
+        raise InvalidTokenException("Invalid regular expression: {}, nothing to repeat".format(pattern))
+    if character in "^$":
+        raise InvalidTokenException("Invalid regular expression: {}, anchors are not supported".format(pattern))
+    return ("set", [(ord(character), ord(character))]), index + 1
+
+
+# Function to parse an escape of a regular expression after the backslash, returns its ranges and the next index
+def parse_escape(pattern: str, index: int):
+    if index >= len(pattern):
+        raise InvalidTokenException("Invalid regular expression: {}, it ends with a backslash".format(pattern))
+    character = pattern[index]
+    if character.lower() in ESCAPE_RANGES:
+        ranges = ESCAPE_RANGES[character.lower()]
+        return (complement(ranges) if character.isupper() else ranges), index + 1
+    if character in "xu":
+        digits = 2 if character == "x" else 4
+        code = pattern[index + 1:index + 1 + digits]
+        if len(code) != digits or any(digit not in "0123456789abcdefABCDEF" for digit in code):
+            raise InvalidTokenException("Invalid escape in the regular expression: {}".format(pattern))
+        return [(int(code, 16), int(code, 16))], index + 1 + digits
+    code = ord(ESCAPE_CHARACTERS.get(character, character))
+    return [(code, code)], index + 1
+
+
+# Function to parse a class of characters after the [, returns the tree and the next index
+def parse_class(pattern: str, index: int):
+    negated = index < len(pattern) and pattern[index] == "^"
+    if negated:
+        index += 1
+    ranges = []
+    first = True
+    while index < len(pattern) and (pattern[index] != "]" or first):
+        first = False
+        if pattern[index] == "\\":
+            escaped, index = parse_escape(pattern, index + 1)
+            # An escape of a class of characters can't be the start of a range
+            if len(escaped) != 1 or escaped[0][0] != escaped[0][1]:
+                ranges.extend(escaped)
+                continue
+            low = escaped[0][0]
+        else:
+            low = ord(pattern[index])
+            index += 1
+        high = low
+        if index + 1 < len(pattern) and pattern[index] == "-" and pattern[index + 1] != "]":
+            if pattern[index + 1] == "\\":
+                escaped, index = parse_escape(pattern, index + 2)
+                high = escaped[0][1]
+            else:
+                high = ord(pattern[index + 1])
+                index += 2
+            if high < low:
+                raise InvalidTokenException("Invalid range in the regular expression: {}".format(pattern))
+        ranges.append((low, high))
+    if index >= len(pattern):
+        raise InvalidTokenException("Invalid regular expression: {}, unclosed class".format(pattern))
+    ranges = merge_ranges(ranges)
+    return ("set", complement(ranges) if negated else ranges), index + 1
+
+
+# Function to sort and join the ranges of characters that overlap or are next to each other
+def merge_ranges(ranges: list):
+    merged = []
+    for low, high in sorted(ranges):
+        if merged and low <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], high))
+        else:
+            merged.append((low, high))
+    return merged
+
+
+# Function to get the ranges of the characters that are not in some ranges
+def complement(ranges: list):
+    result = []
+    low = 0
+    for range_low, range_high in merge_ranges(ranges):
+        if range_low > low:
+            result.append((low, range_low - 1))
+        low = range_high + 1
+    if low <= MAX_CHARACTER:
+        result.append((low, MAX_CHARACTER))
+    return result
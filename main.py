@@ -1,3 +1,5 @@
+import sys
+import cli
 from top_down_parser import tests_t_d
 from bottom_up_parser import tests_b_u
 
@@ -23,6 +25,9 @@ def bottom_up_parser():
 
 
 if __name__ == "__main__":
+    # With arguments the strings are parsed from the command line, without the menu
+    if len(sys.argv) > 1:
+        sys.exit(cli.main(sys.argv[1:]))
     while True:
         print("Main Menu")
         print("1. Access to Top-Down")
@@ -0,0 +1,91 @@
+from array import array
+
+
+# Class with a parse tree stored in parallel arrays, each node is an index of the arrays with the id of its symbol,
+# its first child, its next sibling and the span of the input that it derives, -1 means that there is no child or
+# no sibling. The nodes are only created as objects when the tree is walked with node()
+class ParseTree:
+    def __init__(self, string: str, symbol_names: list):
+        # Parsed string and name of each symbol id
+        self.string = string
+        self.symbol_names = symbol_names
+        self.symbols = array("i")
+        self.first_child = array("i")
+        self.next_sibling = array("i")
+        # Start and end of the span of the string of each node, the end is not included
+        self.start = array("i")
+        self.end = array("i")
+        # Index of the node of the start symbol
+        self.root = -1
+
+    # Function to add a node without children and siblings, returns its index
+    def add_node(self, symbol: int, start: int, end: int):
+        self.symbols.append(symbol)
+        self.first_child.append(-1)
+        self.next_sibling.append(-1)
+        self.start.append(start)
+        self.end.append(end)
+        return len(self.symbols) - 1
+
+    # Function to change the spans of the nodes from indexes of tokens to positions of the string, with the position
+    # where each token starts and ends, an empty span is placed where the next token starts
+    def map_spans(self, token_starts: list, token_ends: list):
+        starts = self.start
+        ends = self.end
+        for node in range(len(starts)):
+            start = starts[node]
+            end = ends[node]
+            starts[node] = token_starts[start]
+            ends[node] = token_ends[end - 1] if end > start else token_starts[start]
+
+    # Function to get the number of nodes of the tree
+    def __len__(self):
+        return len(self.symbols)
+
+    # Function to get the indexes of the children of a node, in order
+    def children(self, index: int):
+        child = self.first_child[index]
+        while child != -1:
+            yield child
+            child = self.next_sibling[child]
+
+    # Function to get the object of a node
+    def node(self, index: int = None):
+        return TreeNode(self, self.root if index is None else index)
+
+    # Function to print the tree, a node in each line with the text that it derives
+    def __str__(self):
+        lines = []
+        # Nodes to print with their depth, the children are added in reverse order so the first one is printed first
+        pending = [(self.root, 0)]
+        while pending:
+            index, depth = pending.pop()
+            lines.append("  " * depth + self.symbol_names[self.symbols[index]] + ": " +
+                         repr(self.string[self.start[index]:self.end[index]]))
+            pending.extend((child, depth + 1) for child in reversed(list(self.children(index))))
+        return "\n".join(lines)
+
+
+# Class with a view of a node of a parse tree, created only when the tree is walked
+class TreeNode:
+    def __init__(self, tree: ParseTree, index: int):
+        self.tree = tree
+        self.index = index
+        self.symbol = tree.symbol_names[tree.symbols[index]]
+        self.start = tree.start[index]
+        self.end = tree.end[index]
+
+    # Function to get the text of the string derived by the node
+    def text(self):
+        return self.tree.string[self.start:self.end]
+
+    # Function to know if the node is a leaf of the tree, a terminal or a non-terminal derived to epsilon
+    def is_leaf(self):
+        return self.tree.first_child[self.index] == -1
+
+    # Function to get the children of the node, in order
+    def children(self):
+        return [TreeNode(self.tree, child) for child in self.tree.children(self.index)]
+
+    def __repr__(self):
+        return "TreeNode({}, {}, {})".format(self.symbol, self.start, self.end)
@@ -1,225 +1,498 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from itertools import islice
+import multiprocessing
+import os
 from grammar import Grammar
-import re
+from lexer import Lexer
+from corpus import parse_corpus
+from profiling import ParserStats
 from exceptions import SymbolNotFoundException
 
 
 # Parent class for all parsers
-class Parser:
-    def __init__(self, grammar: Grammar):
+class Parser(ABC):
+    # Names of the methods timed as phases when the statistics are enabled
+    profiled_phases = ("compute_sets", "update_changed_sets", "solve_first", "solve_follow", "first", "follow",
+                       "build_lexer")
+    # If the rows of the compiled table are symbol ids, instead of states
+    symbol_rows = False
+
+    def __init__(self, grammar: Grammar, profile: bool = False):
         self.grammar = grammar
+        # Cached sets of the grammar by symbol id, computed once for every symbol and recomputed when the grammar
+        # changes. The first and follow sets are bitsets, integers with the bit of each terminal id (the bit 0 is $),
+        # so a union is an or and an intersection is an and, and epsilon is kept apart in the nullable set
+        self.first_sets = {}
+        self.follow_sets = {}
+        self.nullable = set()
+        # Version of the grammar used to compute the cached sets, None if they haven't been computed yet
+        self.sets_version = None
+        # Productions and start symbol id used to compute the cached sets, so after a change of the grammar only
+        # the sets affected by the changed productions are computed again
+        self.analyzed_rules = None
+        self.analyzed_start = None
+        # Old first (with the nullable flag) and old follow of the symbols whose sets changed since the last report
+        self.changed_first = {}
+        self.changed_follow = {}
+        # Lexer of the tokens of the grammar and the tokens used to build it
+        self.lexer = None
+        self.lexer_key = None
+        # Statistics of the phases and the parses, None while they are disabled
+        self.stats = None
+        if profile:
+            self.enable_stats()
 
-# Function to calculate the first of a symbol or string
-    def first(self, string: str, visited: set = None):
-        # Set of non-terminals that have been visited in the recursion
-        if visited is None:
-            visited = set()
-        first = set()
-        # Check if the string is a non-terminal
-        if string in self.grammar.non_terminals:
-            # Check if the non-terminal has been visited to add it to the visited set
-            if string not in visited:
-                visited.add(string)
-            # We must check the first of each derivation of the non-terminal
-            for derivation in self.grammar.productions[string]:
-                first = self.first_string(derivation, first, visited, string)
-        # Check if the string is a terminal to add it to the first set and return it directly
-        elif string in self.grammar.terminals:
-            first.add(string)
-            return first
-        # Check if the string is epsilon to add it to the first set and return it directly
-        elif string == "ε":
-            first.add("ε")
-            return first
-        # Check if the string is a string of more than one character
+    # Function to enable the statistics, the methods of the phases and parse are replaced in this parser by timed
+    # versions and the parses count their steps, a parser without statistics runs the usual methods, so it doesn't
+    # pay for them. Returns the statistics
+    def enable_stats(self):
+        if self.stats is None:
+            self.stats = ParserStats(self.grammar.symbols, self.symbol_rows)
+            for phase in self.profiled_phases:
+                setattr(self, phase, self.stats.timed(phase, getattr(self, phase)))
+            self.parse = self.stats.timed("parse", self.profile_parse)
+        return self.stats
+
+    # Function to disable the statistics and restore the usual methods, returns the statistics collected
+    def disable_stats(self):
+        stats = self.stats
+        if stats is not None:
+            for phase in self.profiled_phases + ("parse",):
+                vars(self).pop(phase, None)
+            self.stats = None
+        return stats
+
+    # Function to parse a string counting its steps and the cells of the table it reads in the statistics
+    def profile_parse(self, string: str):
+        table = self.compiled_table()
+        tokens = table.translate(string)
+        if tokens is None:
+            self.stats.add_parse(False, 0)
+            return False
+        return table.profile(tokens, self.stats)
+
+    # Function to compute the first, follow and nullable sets of every non-terminal in a single fixed-point pass
+    def compute_sets(self):
+        rules = [rule for rule in self.grammar.rules if rule is not None]
+        old_first, old_nullable, old_follow = self.first_sets, self.nullable, self.follow_sets
+        # Every symbol with productions is a non-terminal, even if it was added without receive_production
+        self.first_sets = dict.fromkeys(self.grammar.non_terminal_ids, 0)
+        for non_terminal, _ in rules:
+            self.first_sets.setdefault(non_terminal, 0)
+        self.nullable = set()
+        self.solve_first(rules)
+
+        self.follow_sets = dict.fromkeys(self.first_sets, 0)
+        # Rule 1, $ ∈ follow(S), the end marker is always the symbol 0
+        start = self.grammar.symbol_ids.get(self.grammar.start)
+        if start in self.follow_sets:
+            self.follow_sets[start] = 1
+        self.solve_follow(rules)
+
+        self.record_changes(self.first_sets, old_first, old_nullable, old_follow)
+        self.analyzed_rules = list(self.grammar.rules)
+        self.analyzed_start = start
+        self.sets_version = self.grammar.version
+
+    # Function to compute again only the sets of the symbols affected by the productions that changed since the
+    # last time, the other sets are already the solution, so the fixed-point passes only visit the affected ones
+    def update_changed_sets(self):
+        grammar = self.grammar
+        old_rules = self.analyzed_rules
+        rules = [rule for rule in grammar.rules if rule is not None]
+        # Productions of each non-terminal and productions where each symbol is used
+        productions = {}
+        uses = {}
+        for rule in rules:
+            productions.setdefault(rule[0], []).append(rule)
+            for symbol in rule[1]:
+                uses.setdefault(symbol, []).append(rule)
+        edited = []
+        for number, rule in enumerate(grammar.rules):
+            old_rule = old_rules[number] if number < len(old_rules) else None
+            if old_rule != rule:
+                edited.extend(production for production in (old_rule, rule) if production is not None)
+        old_first, old_nullable, old_follow = dict(self.first_sets), set(self.nullable), dict(self.follow_sets)
+        for non_terminal in grammar.non_terminal_ids.union(productions):
+            self.first_sets.setdefault(non_terminal, 0)
+            self.follow_sets.setdefault(non_terminal, 0)
+
+        # The first of a non-terminal is affected if one of its productions changed or if it uses a symbol whose
+        # first is affected
+        affected_first = reachable({non_terminal for non_terminal, _ in edited},
+                                   lambda symbol: [rule[0] for rule in uses.get(symbol, ())])
+        for symbol in affected_first:
+            self.first_sets[symbol] = 0
+            self.nullable.discard(symbol)
+        self.solve_first([rule for rule in rules if rule[0] in affected_first])
+
+        # The follow of a non-terminal is affected if it is in a changed production, if it is next to a symbol
+        # whose first changed, if it is the old or the new start symbol, or if it ends a production of a
+        # non-terminal whose follow is affected
+        start = grammar.symbol_ids.get(grammar.start)
+        seeds = {symbol for _, symbols in edited for symbol in symbols}
+        for symbol in affected_first:
+            if (self.first_sets[symbol], symbol in self.nullable) != (old_first.get(symbol),
+                                                                      symbol in old_nullable):
+                seeds.update(used for rule in uses.get(symbol, ()) for used in rule[1])
+        if start != self.analyzed_start:
+            seeds.update((start, self.analyzed_start))
+        affected_follow = reachable({symbol for symbol in seeds if symbol in self.follow_sets},
+                                    lambda symbol: [used for rule in productions.get(symbol, ()) for used in rule[1]
+                                                    if used in self.follow_sets])
+        for symbol in affected_follow:
+            self.follow_sets[symbol] = 1 if symbol == start else 0
+        self.solve_follow([rule for rule in rules if not affected_follow.isdisjoint(rule[1])])
+
+        self.record_changes(affected_first | affected_follow, old_first, old_nullable, old_follow)
+        self.analyzed_rules = list(grammar.rules)
+        self.analyzed_start = start
+        self.sets_version = grammar.version
+
+    # Function to calculate the first and nullable sets with the productions, until no set changes
+    def solve_first(self, rules: list):
+        first_sets = self.first_sets
+        nullable = self.nullable
+        # Repeat until no first set and no nullable symbol changes
+        changed = True
+        while changed:
+            changed = False
+            for non_terminal, symbols in rules:
+                first = first_sets[non_terminal]
+                all_nullable = True
+                for symbol in symbols:
+                    if symbol in first_sets:
+                        first |= first_sets[symbol]
+                        if symbol not in nullable:
+                            all_nullable = False
+                            break
+                    else:
+                        first |= 1 << symbol
+                        all_nullable = False
+                        break
+                if all_nullable and non_terminal not in nullable:
+                    nullable.add(non_terminal)
+                    changed = True
+                if first != first_sets[non_terminal]:
+                    first_sets[non_terminal] = first
+                    changed = True
+
+    # Function to calculate the follow sets with the productions, until no set changes
+    def solve_follow(self, rules: list):
+        first_sets = self.first_sets
+        follow_sets = self.follow_sets
+        nullable = self.nullable
+        changed = True
+        while changed:
+            changed = False
+            for non_terminal, symbols in rules:
+                # Walk the derivation from right to left, carrying the first of what follows each symbol
+                trailer = follow_sets[non_terminal]
+                for symbol in reversed(symbols):
+                    if symbol in first_sets:
+                        follow = follow_sets[symbol]
+                        # Rule 2 and 3, A -> αBβ; first(β) and, if β is nullable, follow(A) are in follow(B)
+                        if trailer & ~follow:
+                            follow_sets[symbol] = follow | trailer
+                            changed = True
+                        if symbol in nullable:
+                            trailer |= first_sets[symbol]
+                        else:
+                            trailer = first_sets[symbol]
+                    else:
+                        trailer = 1 << symbol
+
+    # Function to remember the old sets of the symbols whose first or follow changed, keeping the oldest ones
+    # since the last report
+    def record_changes(self, symbols, old_first: dict, old_nullable: set, old_follow: dict):
+        for symbol in symbols:
+            old = (old_first.get(symbol, 0), symbol in old_nullable)
+            if old != (self.first_sets[symbol], symbol in self.nullable):
+                self.changed_first.setdefault(symbol, old)
+            if old_follow.get(symbol, 0) != self.follow_sets[symbol]:
+                self.changed_follow.setdefault(symbol, old_follow.get(symbol, 0))
+
+    # Function to get the cached sets, they are stored with the tables in the cache
+    def stored_sets(self):
+        return {"first": self.first_sets, "follow": self.follow_sets, "nullable": self.nullable}
+
+    # Function to use the sets stored with a table loaded from the cache, they are the sets of the same grammar, so
+    # they are not computed again and the next change of the grammar only computes the affected sets
+    def restore_sets(self, stored: dict):
+        old_first, old_nullable, old_follow = self.first_sets, self.nullable, self.follow_sets
+        self.first_sets = dict(stored["first"])
+        self.follow_sets = dict(stored["follow"])
+        self.nullable = set(stored["nullable"])
+        self.record_changes(self.first_sets, old_first, old_nullable, old_follow)
+        self.analyzed_rules = list(self.grammar.rules)
+        self.analyzed_start = self.grammar.symbol_ids.get(self.grammar.start)
+        self.sets_version = self.grammar.version
+
+    # Function to compute the sets again only if the grammar changed since the last time, if they were computed
+    # before, then only the affected sets are computed
+    def check_sets(self):
+        if self.sets_version != self.grammar.version:
+            if self.analyzed_rules is None:
+                self.compute_sets()
+            else:
+                self.update_changed_sets()
+
+    # Function to create the report with the first and follow sets that changed since the last report
+    def sets_report(self, full: bool = False):
+        report = ChangeReport(full)
+        for symbol, (first, nullable) in self.changed_first.items():
+            if (first, nullable) != (self.first_sets[symbol], symbol in self.nullable):
+                report.first[self.grammar.symbols[symbol]] = (self.bit_names(first) | ({"ε"} if nullable else set()),
+                                                              self.bit_names(self.first_sets[symbol]) |
+                                                              ({"ε"} if symbol in self.nullable else set()))
+        for symbol, follow in self.changed_follow.items():
+            if follow != self.follow_sets[symbol]:
+                report.follow[self.grammar.symbols[symbol]] = (self.bit_names(follow),
+                                                               self.bit_names(self.follow_sets[symbol]))
+        self.changed_first = {}
+        self.changed_follow = {}
+        return report
+
+    # Function to calculate the first of a sequence of symbol ids, returns the bitset of the terminal ids and if it
+    # is nullable
+    def first_ids(self, symbols):
+        first = 0
+        for symbol in symbols:
+            if symbol in self.first_sets:
+                # Adds the first of the current symbol to the first of the sequence
+                first |= self.first_sets[symbol]
+                # If the current symbol can't derive epsilon, then the next symbols don't matter
+                if symbol not in self.nullable:
+                    return first, False
+            else:
+                return first | 1 << symbol, False
+        # Every symbol of the sequence can derive epsilon, so the sequence can derive it too
+        return first, True
+
+    # Function to convert a set of symbol ids into a set of symbol names
+    def symbol_names(self, ids):
+        return {self.grammar.symbols[symbol] for symbol in ids}
+
+    # Function to convert a bitset of terminal ids into a set of symbol names
+    def bit_names(self, bits: int):
+        return self.symbol_names(bit_ids(bits))
+
+    # Function to calculate the first of a symbol or string
+    def first(self, string: str):
+        self.check_sets()
+        # Check if the string is a symbol of the grammar or epsilon, otherwise split it in its symbols
+        if string in self.grammar.non_terminals or string in self.grammar.terminals or string == "ε":
+            symbols = self.grammar.split(string)
         elif len(string) > 1:
-            first = self.first_string(string, first, visited)
+            symbols = self.grammar.split(string)
+            for symbol in symbols:
+                if symbol not in self.grammar.non_terminals and symbol not in self.grammar.terminals:
+                    raise SymbolNotFoundException("Symbol {} is not in the grammar".format(symbol))
         # If none of the above conditions is true, then the string is not in the grammar
         else:
             raise SymbolNotFoundException("Symbol {} is not in the grammar".format(string))
 
+        first, nullable = self.first_ids([self.grammar.symbol_ids[symbol] for symbol in symbols])
+        first = self.bit_names(first)
+        # Epsilon is part of the first set when the whole string can derive it
+        if nullable:
+            first.add("ε")
         return first
 
-    # Function to calculate the first of a string
-    def first_string(self, string: str, first: set, visited: set, symbol: str = None):
-        if symbol is None:
-            symbol = ''
-        pattern = re.compile(r"[A-Z]\'+")
-        element = 0
-        while element < len(string):
-            # Check if the current character is a non-terminal with a single quote (A'),
-            # in this case, we need to check the first of the non-terminal with the single quote (A')
-            # and add 1 to the element to check the next character's first of the string
-            if element <= len(string) - 2 and pattern.match(string[element] + string[element + 1]):
-                if string[element] + string[element + 1] == symbol or string[element] + string[element + 1] in visited:
-                    return first
-                first_of_element = self.first(string[element] + string[element + 1], visited)
-                element += 1
-            else:
-                if string[element] == symbol or string[element] in visited:
-                    return first
-                first_of_element = self.first(string[element], visited)
-
-            if "ε" in first_of_element:
-                # Adds the first of the current character to the first of the symbol except epsilon
-                first_of_element.remove("ε")
-                first = first.union(first_of_element)
-                # If the current character is the last one, then add epsilon to the first of the symbol
-                # This is because the first of all symbols in string contains epsilon
-                if element == len(string) - 1:
-                    first.add("ε")
-            else:
-                # If the current character does not contain epsilon, then add the first of the current character to
-                # the first of the symbol
-                first = first.union(first_of_element)
-                break
-            element += 1
+    # Function to calculate the follow of a symbol
+    def follow(self, symbol: str):
+        self.check_sets()
+        return self.bit_names(self.follow_sets.get(self.grammar.symbol_ids.get(symbol), 0))
 
-        return first
+    # Function to get the lexer of the grammar, None if the grammar has no tokens, so every terminal is a
+    # character of the string. It is built again only when the tokens or the terminals change
+    def build_lexer(self):
+        if not self.grammar.tokens and not self.grammar.ignored:
+            return None
+        key = (self.grammar.lexer_tokens(), list(self.grammar.ignored))
+        if key != self.lexer_key:
+            self.lexer = Lexer(*key)
+            self.lexer_key = key
+        return self.lexer
 
-    @staticmethod
-    # Method insert every element of the first set in the follow set except epsilon
-    def join_first_follow(first: set, follow: set):
-        if "ε" in first:
-            first.remove("ε")
-            # Returns the union of the first and follow sets,
-            # so the follow set will contain its elements and the first set without epsilon
-            follow = follow.union(first)
-            # Add epsilon to the first set, because the first set contains epsilon
-            first.add("ε")
-            return follow
-        else:
-            return first.union(follow)
-
-    # Function to calculate the first two rules of the follow function
-    def follow_one_two(self, symbol):
-        follow = set()
-        # If the symbol is the start symbol, then add $ to the follow set
-        # rule 1, $ ∈ follow(S)
-        if symbol == self.grammar.start:
-            follow.add("$")
-        # We must check every derivation of every non-terminal
-        for non_terminal, derivations in self.grammar.productions.items():
-            for derivation in derivations:
-                # Check if the symbol is in the derivation, and it does not have a single quote (A')
-                # if it has a single quote, then it is not the same symbol, for example, A' != A and A'' != A'
-                pattern = symbol + r"(?!\')"
-                for _ in re.finditer(pattern, derivation):
-                    # Get the index of the symbol in the derivation, the last index of the symbol, for example, if the
-                    # symbol is A' and the derivation is A'BC, then the index will be 1
-                    index = derivation.index(symbol) + len(symbol) - 1
-                    # If the symbol is not the last character of the derivation
-                    if index != len(derivation) - 1:
-                        # First of β
-                        first = self.first(derivation[index + 1:])
-                        # Rule 2, A -> αBβ; all in first(β) are in follow(B) except epsilon
-                        follow = self.join_first_follow(first, follow)
-                    # We erase the symbol from the derivation, so we can find the next occurrence of the symbol
-                    derivation = derivation[:derivation.index(symbol)] + derivation[index + 1:]
-
-        return follow
-
-    # Function to calculate the third rule of the follow function, the restrictions of it
-    def follow_third(self):
-        # Dictionary to store the subsets of the non-terminals
-        subsets = {self.grammar.start: set()}
-        for non_terminal in self.grammar.non_terminals:
-            if non_terminal != self.grammar.start:
-                subsets[non_terminal] = set()
-        # We must check every derivation of every non-terminal
-        for non_terminal, derivations in self.grammar.productions.items():
-            for derivation in derivations:
-                # We must check if the non-terminal is on the right side of the derivation
-                pattern = re.compile(r".*([A-Z]\'*)$")
-                match = pattern.match(derivation)
-                while match:
-                    # If the right side non-terminal is not the same as the principal non-terminal
-                    if match.group(1) != non_terminal:
-                        # Add the right side non-terminal to the principal non-terminal subset, meaning that the
-                        # follow of the principal non-terminal is the follow of the right side non-terminal
-                        subsets[non_terminal].add(match.group(1))
-                    # If the right side non-terminal first set contains epsilon
-                    # then we must check the next right side non-terminal,
-                    # but before we must remove the right side non-terminal from the derivation
-                    if self.first(match.group(1)).__contains__("ε"):
-                        derivation = derivation[:match.end() - len(match.group(1))]
-                    else:
-                        # If the right side non-terminal first set does not contain epsilon, then we must
-                        # stop the loop
-                        break
-                    match = pattern.match(derivation)
-        return subsets
-
-    # Check if there is a loop in the third rule of the follow function
-    def check_loop(self, main_non_terminal, non_terminal, subsets, visited=None):
-        # Initialize the visited set if it is None
-        if visited is None:
-            visited = set()
-        # Add the main non-terminal to the visited set
-        visited.add(main_non_terminal)
-        # Loop through the subset of the main non-terminal
-        for current_non_terminal in subsets[main_non_terminal]:
-            # If the non-terminal is in the subset of the main non-terminal, then there is a loop
-            if current_non_terminal == non_terminal:
-                return True
-            # If the non-terminal is not in the visited set, then we must check if there is a loop in the subset with
-            # the current non-terminal
-            elif current_non_terminal not in visited:
-                if self.check_loop(current_non_terminal, non_terminal, subsets, visited):
-                    return True
-        return False
+    # Function to get the compiled table used to parse, building it if it is needed
+    @abstractmethod
+    def compiled_table(self):
+        pass
 
-    # Function to calculate the follow of a symbol
-    def follow1(self, symbol):
-        # Retrieve the follow of the symbol using the first two rules
-        follow = self.follow_one_two(symbol)
-        # Retrieve the subsets of the non-terminals to check the third rule
-        subsets = self.follow_third()
-        # We must check every subset of the non-terminals
-        for principal, sub in subsets.items():
-            # If the symbol is in the subset, then we must add the follow of the principal non-terminal
-            # to the follow of the symbol
-            if symbol in sub:
-                # If the principal non-terminal is in the subset of the symbol, then we must add the follow of the
-                # principal non-terminal to the follow of the symbol, without recursion to avoid infinite loops
-                if self.check_loop(symbol, principal, subsets):
-                    follow_of_principal = self.follow_one_two(principal)
-                    # If the follow of the principal non-terminal is not empty, then we must add it to the follow
-                    if len(follow_of_principal) > 0:
-                        follow = follow.union(follow_of_principal)
-                    else:
-                        # If the follow of the principal non-terminal is empty, then we must add the follow of the
-                        # principal non-terminal to the follow of the symbol, with recursion
-                        follow = follow.union(self.follow(principal))
-                else:
-                    # If the principal non-terminal is not in the subset of the symbol, then we must add the follow
-                    # of the principal non-terminal to the follow of the symbol, with recursion
-                    follow = follow.union(self.follow(principal))
-        return follow
+    # Function to get the compiled table compressed with row displacement, it uses less memory and parses the same
+    # strings, but it can't build parse trees
+    def compressed_table(self):
+        return self.compiled_table().compress()
 
-    # Function to calculate the follow of a symbol
-    def follow(self, symbol, visited: set = None):
-        # Initialize the visited set if it is None
-        if visited is None:
-            visited = set()
-
-        # Add the symbol to the visited set
-        visited.add(symbol)
-
-        # Retrieve the follow of the symbol using the first two rules
-        follow = self.follow_one_two(symbol)
-
-        # Retrieve the subsets of the non-terminals to check the third rule, and loop through them
-        for principal, sub in self.follow_third().items():
-            # If the symbol is in the subset, then we must add the follow of the principal non-terminal
-            if symbol in sub:
-                # If the principal non-terminal is not in the visited set, then we must add the follow of the
-                # principal non-terminal to the follow of the symbol, with recursion
-                if principal not in visited:
-                    follow = follow.union(self.follow(principal, visited))
-                else:
-                    # If the principal non-terminal is in the visited set, then we must add the follow of the
-                    # principal non-terminal to the follow of the symbol, without recursion to avoid infinite loops
-                    follow = follow.union(self.follow_one_two(principal))
-
-        # Return the follow of the symbol
-        return follow
+    # Function to create a push parser, it reads the string in chunks with feed and ends it with finish
+    def push_parser(self):
+        return self.compiled_table().push_parser()
+
+    # Function to parse many strings, returns a lazy iterator with the result of each string in the same order,
+    # so the strings can come from a generator and are never stored in a list
+    def parse_many(self, strings):
+        if self.stats is not None:
+            return map(self.parse, strings)
+        return map(self.compiled_table().parse, strings)
+
+    # Function to parse every line of a file without loading it in memory, returns the results in a bitmap
+    def parse_file(self, path: str):
+        return parse_corpus(self.compiled_table(), path)
+
+    # Function to parse many strings with a pool of processes, returns a lazy iterator with the result of each
+    # string in the same order. The compiled table is sent once to each process, the strings are sent in chunks
+    # and only a few chunks per process are pending at a time, so the strings are never stored in a list
+    def parse_parallel(self, strings, workers: int = None, chunk_size: int = 1000):
+        table = self.compiled_table()
+        if workers is None:
+            workers = os.cpu_count() or 1
+        with multiprocessing.Pool(workers, initializer=init_worker, initargs=(table,)) as pool:
+            pending = deque()
+            for chunk in split_chunks(strings, chunk_size):
+                pending.append(pool.apply_async(parse_chunk, (chunk,)))
+                # Wait for the oldest chunk when there are enough chunks pending, to keep the results in order
+                if len(pending) >= workers * 2:
+                    yield from map(bool, pending.popleft().get())
+            while pending:
+                yield from map(bool, pending.popleft().get())
+
+
+# Class with the entries of a parser that changed after an update of the grammar
+class ChangeReport:
+    def __init__(self, full: bool = False):
+        # True if the table was built from scratch, then the cells and states are not listed
+        self.full = full
+        # Old and new first (with ε if the symbol is nullable) and follow of the symbols whose sets changed
+        self.first = {}
+        self.follow = {}
+        # Cells of the table that changed, as (row, column, old value, new value)
+        self.cells = []
+        # Numbers of the added and removed states, and new number of the states that moved to another number
+        self.added_states = []
+        self.removed_states = []
+        self.renumbered_states = {}
+        # True if the table can't be updated because the grammar has a conflict now
+        self.conflict = False
+
+    # Function to print the report
+    def __str__(self):
+        lines = ["Table built again" if self.full else "Table updated"]
+        if self.conflict:
+            lines.append("The grammar has a conflict, the table must be created again")
+        for symbol, (old, new) in self.first.items():
+            lines.append(f'first({symbol}): {sorted(old)} -> {sorted(new)}')
+        for symbol, (old, new) in self.follow.items():
+            lines.append(f'follow({symbol}): {sorted(old)} -> {sorted(new)}')
+        if self.added_states:
+            lines.append(f'Added states: {self.added_states}')
+        if self.removed_states:
+            lines.append(f'Removed states: {self.removed_states}')
+        for old, new in self.renumbered_states.items():
+            lines.append(f'State {old} is now the state {new}')
+        for row, column, old, new in self.cells:
+            lines.append(f'[{row}, {column}]: {old} -> {new}')
+        return "\n".join(lines)
+
+
+# Parent class of the push parsers, they read the string in chunks and keep their stack between the chunks, so only
+# the current chunk is in memory. The string is rejected as soon as a symbol can't continue it
+class PushParser(ABC):
+    def __init__(self, table):
+        self.table = table
+        # Number of symbols read, if the string is rejected it is the position of the symbol that was not expected
+        self.position = 0
+        # None until the string is rejected or finished, then if the string is accepted
+        self.accepted = None
+        # Text of a token that could go on in the next chunk, only used with a lexer
+        self.pending = ""
+
+    # Function to push a terminal id to the stack, returns False if the terminal is not expected
+    @abstractmethod
+    def push(self, token: int):
+        pass
+
+    # Function to read the tokens of the pending text and a chunk with the lexer, the last token is kept pending
+    # if it could go on in the next chunk, unless final is True. A part that is not a token is read as None
+    def scan(self, chunk: str, final: bool):
+        text = self.pending + chunk
+        tokens = []
+        position, error = self.table.lexer.scan(text, tokens, final=final)
+        self.pending = text[position:]
+        if error:
+            tokens.append(None)
+        return tokens
+
+    # Function to push the terminal ids of a chunk, returns False if one of them is not expected
+    def push_tokens(self, tokens):
+        push = self.push
+        for token in tokens:
+            # $ or a symbol that is not a terminal can't be in the string, $ is only pushed by finish
+            if not token or not push(token):
+                self.accepted = False
+                return False
+            self.position += 1
+        return True
+
+    # Function to read the next chunk of the string, returns False if the string is already rejected
+    def feed(self, chunk: str):
+        if self.accepted is not None:
+            if self.accepted:
+                raise ValueError("The string is already finished")
+            return False
+        if self.table.lexer is None:
+            return self.push_tokens(map(self.table.symbol_ids.get, chunk))
+        return self.push_tokens(self.scan(chunk, False))
+
+    # Function to end the string, returns if it is accepted
+    def finish(self):
+        if self.accepted is None:
+            if self.table.lexer is not None and not self.push_tokens(self.scan("", True)):
+                return False
+            self.accepted = self.push(0)
+        return self.accepted
+
+
+# Function to get the symbols reachable from some symbols following a relation, including them
+def reachable(symbols: set, relation):
+    reached = set(symbols)
+    pending = list(reached)
+    while pending:
+        for symbol in relation(pending.pop()):
+            if symbol not in reached:
+                reached.add(symbol)
+                pending.append(symbol)
+    return reached
+
+
+# Function to get the ids of the bits of a bitset in increasing order, each step takes the lowest bit
+def bit_ids(bits: int):
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+# Compiled table of the worker process, received once when the process starts
+worker_table = None
+
+
+# Function to receive the compiled table in a worker process
+def init_worker(table):
+    global worker_table
+    worker_table = table
+
+
+# Function to parse a chunk of strings in a worker process, returns a byte with 1 or 0 for each string
+def parse_chunk(chunk: list):
+    return bytes(map(worker_table.parse, chunk))
+
+
+# Function to split an iterable of strings into lists of at most size strings
+def split_chunks(strings, size: int):
+    strings = iter(strings)
+    chunk = list(islice(strings, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(strings, size))
@@ -0,0 +1,83 @@
+import time
+from collections import Counter
+
+
+# Class with the statistics of a parser, they are collected only while they are enabled in the parser, so a parser
+# without statistics runs the same code as before
+class ParserStats:
+    def __init__(self, symbol_names: list, symbol_rows: bool = False):
+        # Names of the symbol ids, to write the cells in the report, and if the rows of the table are symbol ids
+        self.symbol_names = symbol_names
+        self.symbol_rows = symbol_rows
+        # Calls and total seconds of each phase, the time of a phase includes the phases it calls
+        self.calls = Counter()
+        self.seconds = Counter()
+        # Steps of all the parses by kind, shift and reduce in the bottom-up parser, expand and match in the top-down
+        self.steps = Counter()
+        # Number of cells read from the table in all the parses
+        self.lookups = 0
+        # Times each row of the table is read, by state in the bottom-up parser and by non-terminal id in the
+        # top-down parser, and times each cell is read, by (row, symbol id)
+        self.rows = Counter()
+        self.cells = Counter()
+        # Number of parses, total and most steps of a parse, and number of accepted strings
+        self.parses = 0
+        self.total_steps = 0
+        self.max_steps = 0
+        self.accepted = 0
+
+    # Function to wrap a function of a phase, each call adds its time to the phase
+    def timed(self, phase: str, function):
+        calls = self.calls
+        seconds = self.seconds
+
+        def timed_function(*arguments, **keywords):
+            start = time.perf_counter()
+            try:
+                return function(*arguments, **keywords)
+            finally:
+                seconds[phase] += time.perf_counter() - start
+                calls[phase] += 1
+        return timed_function
+
+    # Function to add the result and the steps of a parse
+    def add_parse(self, accepted: bool, lookups: int, **steps):
+        self.steps.update(steps)
+        self.lookups += lookups
+        parse_steps = sum(steps.values())
+        self.parses += 1
+        self.total_steps += parse_steps
+        self.max_steps = max(self.max_steps, parse_steps)
+        if accepted:
+            self.accepted += 1
+
+    # Function to clear the statistics
+    def reset(self):
+        self.__init__(self.symbol_names, self.symbol_rows)
+
+    # Function to get the rows or the cells read more times, as (row or cell, times)
+    def hottest(self, counter: Counter, number: int = 10):
+        return counter.most_common(number)
+
+    # Function to write a row of the table, a state number or the name of a non-terminal
+    def row_name(self, row: int):
+        return self.symbol_names[row] if self.symbol_rows else str(row)
+
+    # Function to print the statistics
+    def __str__(self):
+        lines = ["Phases:"]
+        for phase, seconds in self.seconds.most_common():
+            lines.append(f'  {phase}: {self.calls[phase]} calls, {seconds * 1000:.3f} ms')
+        parses = self.parses
+        lines.append(f'Parses: {parses}, accepted: {self.accepted}, lookups: {self.lookups}')
+        for kind, steps in sorted(self.steps.items()):
+            lines.append(f'  {kind}: {steps}')
+        if parses:
+            lines.append(f'  steps per parse: {self.total_steps / parses:.1f}, max: {self.max_steps}')
+        if self.rows:
+            lines.append("Hottest rows: " + ", ".join(f'{self.row_name(row)} ({times})'
+                                                      for row, times in self.hottest(self.rows)))
+        if self.cells:
+            lines.append("Hottest cells: " + ", ".join(f'[{self.row_name(row)}, {self.symbol_names[symbol]}] ({times})'
+                                                       for (row, symbol), times in self.hottest(self.cells)))
+        return "\n".join(lines)
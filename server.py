@@ -0,0 +1,212 @@
+import argparse
+import asyncio
+import json
+import time
+
+from cli import PARSERS, build_parser
+from grammar import read_grammars
+
+
+# Function to load the grammars of a file, returns a dictionary from the number of each grammar, starting from 1,
+# and from its name to its compiled table, and the list of the grammars that can't be parsed with the kind of parser
+def load_grammars(path: str, kind: str, cache_dir: str = None):
+    tables = {}
+    skipped = []
+    for index, (name, productions) in enumerate(read_grammars(path)):
+        try:
+            table = build_parser(productions, kind, cache_dir).compiled_table()
+        except Exception as exception:
+            skipped.append((str(index + 1), name, "{}: {}".format(type(exception).__name__, exception)))
+            continue
+        tables[str(index + 1)] = table
+        if name is not None:
+            tables.setdefault(name, table)
+    return tables, skipped
+
+
+# Class with a server that keeps the compiled tables in memory and recognizes the strings of its clients. Each line
+# of a client is a request, a JSON object like {"id": 1, "grammar": "2", "string": "i+i"} that is answered with
+# {"id": 1, "accepted": true, "queue_seconds": ..., "parse_seconds": ...}, or a plain string for the first grammar
+# that is answered with 1 or 0. The requests of all the clients go to a bounded queue and are parsed in batches,
+# a client waits to send more requests while the queue or its own pending answers are full. The batches are parsed
+# one after another in a thread of the executor, so the loop keeps reading and writing while a batch is parsed and a
+# table is never used by two threads at the same time
+class RecognitionServer:
+    def __init__(self, tables: dict, batch_size: int = 64, batch_delay: float = 0.001, max_pending: int = 1024):
+        self.tables = tables
+        # Grammar of the requests without a grammar
+        self.default_grammar = next(iter(tables), None)
+        self.batch_size = batch_size
+        # Seconds to wait for more requests when a batch is not full
+        self.batch_delay = batch_delay
+        self.max_pending = max_pending
+        # Queue of the requests to parse and task that parses them, created in the loop of the server
+        self.queue = None
+        self.batch_task = None
+        # Number of parsed requests and batches
+        self.requests = 0
+        self.batches = 0
+
+    # Function to start the server in a TCP port or in a Unix socket, returns the asyncio server
+    async def start(self, host: str = "127.0.0.1", port: int = 8765, path: str = None):
+        self.queue = asyncio.Queue(self.max_pending)
+        self.batch_task = asyncio.ensure_future(self.process_batches())
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle_connection, path=path)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    # Function to parse the requests of the queue in batches, after the first request of a batch it waits a moment
+    # so the requests that arrive at the same time are parsed together
+    async def process_batches(self):
+        loop = asyncio.get_event_loop()
+        queue = self.queue
+        while True:
+            batch = [await queue.get()]
+            if self.batch_delay and queue.qsize() < self.batch_size - 1:
+                await asyncio.sleep(self.batch_delay)
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                answers = await loop.run_in_executor(None, self.parse_batch, batch)
+            except Exception as exception:
+                answers = [exception] * len(batch)
+            for (table, string, future, queued), answer in zip(batch, answers):
+                if future.cancelled():
+                    continue
+                if isinstance(answer, Exception):
+                    future.set_exception(answer)
+                else:
+                    future.set_result(answer)
+            self.requests += len(batch)
+            self.batches += 1
+            # Let the clients read the answers and send more requests before the next batch
+            await asyncio.sleep(0)
+
+    # Function to parse the requests of a batch, returns the answer of each request or the exception of its parse
+    def parse_batch(self, batch: list):
+        answers = []
+        for table, string, future, queued in batch:
+            start = time.perf_counter()
+            try:
+                accepted = table.parse(string)
+            except Exception as exception:
+                answers.append(exception)
+                continue
+            answers.append({"accepted": accepted, "queue_seconds": start - queued,
+                            "parse_seconds": time.perf_counter() - start})
+        return answers
+
+    # Function to stop parsing the requests of the queue
+    async def stop(self):
+        if self.batch_task is not None:
+            self.batch_task.cancel()
+            try:
+                await self.batch_task
+            except asyncio.CancelledError:
+                pass
+            self.batch_task = None
+
+    # Function to read a request, returns its id, if it is JSON, its table, its string and its error
+    def read_request(self, line: bytes):
+        text = line.decode("utf-8", "replace").rstrip("\r\n")
+        if not text.startswith("{"):
+            return None, False, self.tables.get(self.default_grammar), text, None
+        try:
+            request = json.loads(text)
+        except ValueError:
+            return None, True, None, None, "Invalid JSON"
+        if not isinstance(request, dict):
+            return None, True, None, None, "The request must be a JSON object"
+        request_id = request.get("id")
+        grammar = str(request.get("grammar", self.default_grammar))
+        string = request.get("string")
+        if grammar not in self.tables:
+            return request_id, True, None, None, "Unknown grammar: {}".format(grammar)
+        if not isinstance(string, str):
+            return request_id, True, None, None, "The string must be a JSON string"
+        return request_id, True, self.tables[grammar], string, None
+
+    # Function to read the requests of a client, the answers are written in the same order by another task
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        loop = asyncio.get_event_loop()
+        answers = asyncio.Queue(self.max_pending)
+        sender = asyncio.ensure_future(self.send_answers(answers, writer))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request_id, is_json, table, string, error = self.read_request(line)
+                future = loop.create_future()
+                if error is not None:
+                    future.set_result({"error": error})
+                elif table is None:
+                    future.set_result({"error": "There are no grammars"})
+                else:
+                    await self.queue.put((table, string, future, time.perf_counter()))
+                await answers.put((request_id, is_json, future))
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            await answers.put(None)
+            await sender
+
+    # Function to write the answers of a client in the order of its requests
+    async def send_answers(self, answers: asyncio.Queue, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                item = await answers.get()
+                if item is None:
+                    break
+                request_id, is_json, future = item
+                try:
+                    answer = await future
+                except Exception as exception:
+                    answer = {"error": "{}: {}".format(type(exception).__name__, exception)}
+                if is_json:
+                    writer.write(json.dumps(dict(id=request_id, **answer)).encode("utf-8") + b"\n")
+                elif "error" in answer:
+                    writer.write("error: {}\n".format(answer["error"]).encode("utf-8"))
+                else:
+                    writer.write(b"1\n" if answer["accepted"] else b"0\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+# Function to load the grammars and run the server until it is stopped
+async def serve(arguments):
+    tables, skipped = load_grammars(arguments.grammars, arguments.parser, arguments.cache_dir)
+    for number, name, error in skipped:
+        print("Grammar {} ({}) skipped: {}".format(number, name, error))
+    server = RecognitionServer(tables, arguments.batch_size, arguments.batch_delay / 1000, arguments.max_pending)
+    asyncio_server = await server.start(arguments.host, arguments.port, arguments.unix)
+    print("Serving {} grammars on {}".format(len(set(map(id, tables.values()))),
+                                           arguments.unix or "{}:{}".format(arguments.host, arguments.port)))
+    try:
+        async with asyncio_server:
+            await asyncio_server.serve_forever()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(description="Server that recognizes strings with the grammars of a "
+                                                          "file, keeping their tables in memory")
+    argument_parser.add_argument("grammars", help="file with the grammars")
+    argument_parser.add_argument("-p", "--parser", choices=PARSERS, default="slr", help="kind of parser")
+    argument_parser.add_argument("--host", default="127.0.0.1", help="host of the TCP server")
+    argument_parser.add_argument("--port", type=int, default=8765, help="port of the TCP server")
+    argument_parser.add_argument("--unix", help="path of a Unix socket, used instead of the TCP server")
+    argument_parser.add_argument("--batch-size", type=int, default=64, help="maximum requests parsed together")
+    argument_parser.add_argument("--batch-delay", type=float, default=1.0,
+                                 help="milliseconds to wait for more requests when a batch is not full")
+    argument_parser.add_argument("--max-pending", type=int, default=1024,
+                                 help="maximum requests waiting to be parsed")
+    argument_parser.add_argument("--cache-dir", help="directory of the cached tables")
+    try:
+        asyncio.run(serve(argument_parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,51 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from grammar import Grammar
+
+# Version of the format of the cached tables, it must change every time the compiled tables change, so the old
+# files are never loaded
+CACHE_FORMAT = 10
+
+
+# Function to calculate the fingerprint of a grammar for a kind of parser, two grammars with the same productions,
+# symbols and start symbol have the same fingerprint, so they can share the cached table
+def grammar_fingerprint(grammar: Grammar, kind: str):
+    canonical = repr((CACHE_FORMAT, kind, grammar.start, list(grammar.productions.items()), grammar.symbols,
+                      grammar.rules, sorted(grammar.non_terminals), sorted(grammar.terminals)))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+# Function to get the path of the cached table of a fingerprint
+def cache_path(directory: str, fingerprint: str):
+    return os.path.join(directory, fingerprint + ".table")
+
+
+# Function to load a cached table, returns None if it is not in the cache or it can't be read.
+# The files are pickles, so the cache directory must only be writable by trusted users
+def load_table(directory: str, fingerprint: str):
+    try:
+        with open(cache_path(directory, fingerprint), "rb") as file:
+            data = pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if not isinstance(data, dict) or data.get("format") != CACHE_FORMAT or data.get("fingerprint") != fingerprint:
+        return None
+    return data["table"]
+
+
+# Function to store a table in the cache, the file is written to a temporary file first and then renamed,
+# so other processes never read a table written by half
+def store_table(directory: str, fingerprint: str, table: dict):
+    os.makedirs(directory, exist_ok=True)
+    data = {"format": CACHE_FORMAT, "fingerprint": fingerprint, "table": table}
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_path, cache_path(directory, fingerprint))
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
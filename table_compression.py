@@ -0,0 +1,42 @@
+from array import array
+
+
+# Function to pack the rows of a sparse table into a single vector with row displacement (comb vector). Each row is
+# a list of its cells as (column, value) or None, every row gets a base, the cell of a column is in the position
+# base + column, and the rows are placed first fit, the rows with more cells first, so the cells of different rows
+# never share a position. The position of each cell stores the base of its row in the checks, a cell belongs to a
+# row only if its check is the base of the row, so the bases are unique, except for equal rows that share their
+# base. A row that is None gets the base -1. Returns the arrays of the bases, the values and the checks, the
+# vectors have room for every column lower than width in every row, and the positions without a cell are empty
+def pack_rows(rows: list, width: int, empty: int):
+    bases = array("i", [-1]) * len(rows)
+    values = array("i", [empty]) * width
+    checks = array("i", [-1]) * width
+    # Base of each different row, the equal rows are placed only once
+    placed = {}
+    used_bases = set()
+    # Every position before the first free position is used, so no row is placed before it
+    first_free = 0
+    order = sorted((number for number, row in enumerate(rows) if row is not None),
+                   key=lambda number: -len(rows[number]))
+    for number in order:
+        cells = tuple(sorted(rows[number]))
+        if cells in placed:
+            bases[number] = placed[cells]
+            continue
+        base = max(first_free - cells[0][0], 0) if cells else 0
+        while base in used_bases or any(base + column < len(checks) and checks[base + column] != -1
+                                        for column, _ in cells):
+            base += 1
+        if base + width > len(values):
+            values.extend(array("i", [empty]) * (base + width - len(values)))
+            checks.extend(array("i", [-1]) * (base + width - len(checks)))
+        for column, value in cells:
+            values[base + column] = value
+            checks[base + column] = base
+        bases[number] = base
+        placed[cells] = base
+        used_bases.add(base)
+        while first_free < len(checks) and checks[first_free] != -1:
+            first_free += 1
+    return bases, values, checks
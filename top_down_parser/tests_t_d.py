@@ -2,7 +2,7 @@ import time
 import os
 
 from exceptions import *
-from grammar import Grammar, read_strings
+from grammar import Grammar, iter_strings
 from top_down_parser.top_down_parser import TopDownParser
 
 
@@ -299,6 +299,171 @@ def test_parser():
     print(parser_2.parse("(x;x;x;)"))
 
 
+# Test the parse many function, reading the strings of a file as a stream
+def test_parse_many():
+    # Create a grammar for the parser
+    grammar = Grammar()
+    grammar.receive_production("E -> TE'")
+    grammar.receive_production("E' -> +TE'|ε")
+    grammar.receive_production("T->FT'")
+    grammar.receive_production("T'->*FT'|ε")
+    grammar.receive_production("F->(E)|i")
+    grammar.set_start("E")
+    # Create a parser for the grammar
+    parser = TopDownParser(grammar)
+    # Print the parsing result of each string in the file N.txt, should be True, True, True, False
+    path = os.path.join(os.path.dirname(__file__), "strings", "N.txt")
+    for string, accepted in zip(iter_strings(path), parser.parse_many(iter_strings(path))):
+        print(f'{string}: {accepted}')
+
+
+# Test the update of the table after adding a production to the grammar
+def test_update():
+    # Create a grammar for the parser
+    grammar = Grammar()
+    grammar.receive_production("E -> TE'")
+    grammar.receive_production("E' -> +TE'|ε")
+    grammar.receive_production("T->FT'")
+    grammar.receive_production("T'->*FT'|ε")
+    grammar.receive_production("F->(E)|i")
+    grammar.set_start("E")
+    # Create a parser for the grammar and fill the table
+    parser = TopDownParser(grammar)
+    parser.create_table()
+    # Add the negative numbers, only the rows of E, T and F should change
+    grammar.receive_production("F->-F")
+    print(parser.update_sets())
+    # Print the parsing result of the string -i*-(i), should be True
+    print(parser.parse("-i*-(i)"))
+
+
+# Test of the parse tree
+def test_parse_tree():
+    # Create a grammar for the parser
+    grammar = Grammar()
+    grammar.receive_production("E -> TE'")
+    grammar.receive_production("E' -> +TE'|ε")
+    grammar.receive_production("T->FT'")
+    grammar.receive_production("T'->*FT'|ε")
+    grammar.receive_production("F->(E)|i")
+    grammar.set_start("E")
+    parser = TopDownParser(grammar)
+    # Print the tree of the string i+i*(i), the nodes of E' and T' derived to epsilon have an empty text
+    tree = parser.parse_tree("i+i*(i)")
+    print(tree)
+    # Print the children of the root, should be T and E'
+    print(tree.node().children())
+    # A string that is not accepted has no tree
+    print(parser.parse_tree("i+"))
+
+
+# Test of the push parser
+def test_push_parser():
+    # Create a grammar for the parser
+    grammar = Grammar()
+    grammar.receive_production("E -> TE'")
+    grammar.receive_production("E' -> +TE'|ε")
+    grammar.receive_production("T->FT'")
+    grammar.receive_production("T'->*FT'|ε")
+    grammar.receive_production("F->(E)|i")
+    grammar.set_start("E")
+    parser = TopDownParser(grammar)
+    # Read the string i+i*(i) in three chunks, should print True
+    push_parser = parser.push_parser()
+    for chunk in ["i+", "i*(", "i)"]:
+        push_parser.feed(chunk)
+    print(push_parser.finish())
+    # The string i+*i is rejected in the *, the chunks after it are not read, should print False and 2
+    push_parser = parser.push_parser()
+    print(push_parser.feed("i+*i"))
+    print(push_parser.position)
+
+
+# Test of the tokens of more than one character
+def test_tokens():
+    # Create a grammar with identifiers and numbers, the spaces are skipped
+    grammar = Grammar()
+    grammar.add_token("id", r"[a-z][a-z0-9]*", regex=True)
+    grammar.add_token("num", r"[0-9]+", regex=True)
+    grammar.add_ignored(r"\s+")
+    grammar.receive_production("E -> TE'")
+    grammar.receive_production("E' -> +TE'|ε")
+    grammar.receive_production("T->FT'")
+    grammar.receive_production("T'->*FT'|ε")
+    grammar.receive_production("F->(E)|id|num")
+    grammar.set_start("E")
+    parser = TopDownParser(grammar)
+    # Print the parsing result of the string x1 + 42 * (y), should be True
+    print(parser.parse("x1 + 42 * (y)"))
+    # Print the parsing result of the string x1 42, should be False
+    print(parser.parse("x1 42"))
+    # Print the tree of the string x1 + 42, the leaves are the tokens
+    print(parser.parse_tree("x1 + 42"))
+
+
+# Test of the compressed table
+def test_compressed_table():
+    # Create the grammar
+    grammar = Grammar()
+    grammar.receive_production("E -> TE'")
+    grammar.receive_production("E' -> +TE'|ε")
+    grammar.receive_production("T->FT'")
+    grammar.receive_production("T'->*FT'|ε")
+    grammar.receive_production("F->(E)|i")
+    grammar.set_start("E")
+    parser = TopDownParser(grammar)
+    table = parser.compressed_table()
+    # Print the size of the vector of the compressed table
+    print(len(table.values))
+    # Print the parsing result of the strings i+i*(i) and i+, should be True and False
+    print(table.parse("i+i*(i)"))
+    print(table.parse("i+"))
+
+    # A grammar whose language is empty has no row for the start symbol, the empty string should return False
+    grammar_2 = Grammar()
+    grammar_2.receive_production("S -> Sac|S")
+    grammar_2.set_start("S")
+    parser_2 = TopDownParser(grammar_2)
+    print(parser_2.parse(""), parser_2.compressed_table().parse(""))
+
+
+# Test of the statistics of the phases and the parses
+def test_stats():
+    # Create the grammar
+    grammar = Grammar()
+    grammar.receive_production("E -> TA")
+    grammar.receive_production("A -> +TA|ε")
+    grammar.receive_production("T -> FB")
+    grammar.receive_production("B -> *FB|ε")
+    grammar.receive_production("F -> (E)|i")
+    grammar.set_start("E")
+    parser = TopDownParser(grammar)
+    stats = parser.enable_stats()
+    parser.parse("i+i*(i)")
+    parser.parse("i+")
+    # Print the time of each phase, the steps of the parses and the hottest rows and cells
+    print(stats)
+
+
+# Test of the conflicts of a grammar that is not LL(1), every conflicting cell is found in a single check
+def test_conflicts():
+    grammar = Grammar()
+    grammar.receive_production("S -> aA|aB|C")
+    grammar.receive_production("A -> b|ε")
+    grammar.receive_production("B -> b")
+    grammar.receive_production("C -> ε|A")
+    grammar.set_start("S")
+    parser = TopDownParser(grammar)
+    # Print every conflict as (non-terminal, terminal, derivations)
+    for conflict in parser.ll1_conflicts():
+        print(conflict)
+    # The exception lists the same conflicts
+    try:
+        parser.create_table()
+    except NotLL1Exception as e:
+        print(e)
+
+
 # Test with a menu
 def final_test(grammar: Grammar = None, parser: TopDownParser = None):
     # Create a grammar for the parser
@@ -460,7 +625,7 @@ def option_8(parser):
         action = input('Insert f to parse strings from a file or s to parse a string from console: ')
         if action == 'f':
             file_name = input('Insert the name of the file: ')
-            strings = read_strings(os.path.join(os.path.dirname(__file__), "strings", file_name))
+            strings = iter_strings(os.path.join(os.path.dirname(__file__), "strings", file_name))
             for string in strings:
                 check_parse_string(string, parser)
         elif action == 's':
@@ -1,33 +1,127 @@
-from collections import deque
 from exceptions import NotLL1Exception
 from grammar import Grammar
-from parser import Parser
-import re
+from parser import Parser, ChangeReport, PushParser, bit_ids
+from array import array
+from parse_tree import ParseTree
+from table_cache import grammar_fingerprint, load_table, store_table
+from table_compression import pack_rows
 
 
 # Class to handle the top-down parser of a grammar
 class TopDownParser (Parser):
-    def __init__(self, grammar: Grammar):
-        super().__init__(grammar)
-        self.table = [[None for _ in range(len(grammar.terminals) + 1)] for _ in range(
-            len(grammar.non_terminals))]
-        self.rows = list(grammar.non_terminals)
-        self.columns = list(grammar.terminals.union({'$'}))
+    # Phases timed by the statistics, the rows of the compiled table are the non-terminal ids
+    profiled_phases = Parser.profiled_phases + ("join_firsts", "check_ll1", "is_ll1", "create_table",
+                                                "update_table")
+    symbol_rows = True
 
-    # Function to update the rows and columns of the table
+    def __init__(self, grammar: Grammar, cache_dir: str = None, profile: bool = False):
+        super().__init__(grammar, profile)
+        # Directory of the cached tables, if it is None the tables are always built
+        self.cache_dir = cache_dir
+        # Productions used to fill the table, None if the table is not filled
+        self.table_rules = None
+        self.update_sets()
+
+    # Function to update the table after a change of the grammar, if the table is filled, then only the rows of
+    # the affected non-terminals are filled again, returns a report with the entries that changed
     def update_sets(self):
+        if self.table_rules is not None:
+            return self.update_table()
+        self.reset_table()
+        return ChangeReport(True)
+
+    # Function to update the rows and columns of the table
+    def reset_table(self):
+        self.reset_cells()
+        # Compiled table used by the parse loop, and flag to know if the table is filled
+        self.parse_table = None
+        self.table_ready = False
+        self.table_rules = None
+        # Conflicts found by the last check and the version of the grammar checked, None if it wasn't checked
+        self.conflicts = None
+        self.conflicts_version = None
+
+    # Function to empty the cells of the table with a row for each non-terminal and a column for each terminal
+    def reset_cells(self):
         self.rows = list(self.grammar.non_terminals)
         self.columns = list(self.grammar.terminals.union({'$'}))
+        # Position of each row and column in the table
+        self.row_index = {row: index for index, row in enumerate(self.rows)}
+        self.column_index = {column: index for index, column in enumerate(self.columns)}
         self.table = [[None for _ in range(len(self.grammar.terminals) + 1)] for _ in range(
             len(self.grammar.non_terminals))]
 
+    # Function to fill again the rows of the non-terminals affected by the productions that changed and by the
+    # first and follow sets that changed, returns the report of the changes
+    def update_table(self):
+        grammar = self.grammar
+        self.check_sets()
+        report = self.sets_report()
+        # New rows and columns for the new symbols
+        for non_terminal in grammar.non_terminals.difference(self.row_index):
+            self.row_index[non_terminal] = len(self.rows)
+            self.rows.append(non_terminal)
+            self.table.append([None] * len(self.columns))
+        for terminal in grammar.terminals.difference(self.column_index):
+            self.column_index[terminal] = len(self.columns)
+            self.columns.append(terminal)
+            for row in self.table:
+                row.append(None)
+        self.parse_table.update_symbols({terminal: grammar.symbol_ids[terminal] for terminal in grammar.terminals},
+                                        grammar.symbol_ids[grammar.start], len(grammar.symbols))
+        self.parse_table.lexer = self.build_lexer()
+
+        # A row is affected if a production of the non-terminal changed, if the follow of the non-terminal changed,
+        # or if a production of the non-terminal uses a symbol whose first changed
+        affected = {grammar.symbol_ids[symbol] for symbol in report.follow}
+        for number, rule in enumerate(grammar.rules):
+            old_rule = self.table_rules[number] if number < len(self.table_rules) else None
+            if old_rule != rule:
+                affected.update(production[0] for production in (old_rule, rule) if production is not None)
+        changed_first = {grammar.symbol_ids[symbol] for symbol in report.first}
+        if changed_first:
+            for rule in grammar.rules:
+                if rule is not None and not changed_first.isdisjoint(rule[1]):
+                    affected.add(rule[0])
+
+        for symbol in affected:
+            non_terminal = grammar.symbols[symbol]
+            row = self.table[self.row_index[non_terminal]]
+            old_row = list(row)
+            row[:] = [None] * len(row)
+            self.parse_table.rows[symbol] = None
+            # If two derivations go to the same cell, then the grammar is not LL(1) anymore
+            nullable_derivations = 0
+            for derivation, rule in grammar.rule_ids.get(non_terminal, {}).items():
+                symbols = grammar.rules[rule][1]
+                first, nullable = self.first_ids(symbols)
+                if nullable:
+                    nullable_derivations += 1
+                    first = first | self.follow_sets[symbol]
+                for terminal in bit_ids(first):
+                    if row[self.column_index[grammar.symbols[terminal]]] not in (None, derivation):
+                        report.conflict = True
+                    self.insert_into_table(non_terminal, grammar.symbols[terminal], derivation)
+                    self.parse_table.add_cell(symbol, terminal, tuple(reversed(symbols)))
+            if nullable_derivations > 1:
+                report.conflict = True
+            for column, (old, new) in enumerate(zip(old_row, row)):
+                if old != new:
+                    report.cells.append((non_terminal, self.columns[column], old, new))
+
+        # With a conflict the table is created again when it is needed, so the conflict is raised
+        if report.conflict:
+            self.reset_table()
+        else:
+            self.table_rules = list(grammar.rules)
+            self.conflicts = []
+            self.conflicts_version = grammar.version
+            self.store_cached_table()
+        return report
+
     # Function to check if the table is filled
     def is_filled(self):
-        for row in self.table:
-            for element in row:
-                if element is not None:
-                    return True
-        return False
+        return self.table_ready
 
     # Function to join the first of a list of derivations
     def join_firsts(self, derivations):
@@ -36,113 +130,134 @@ class TopDownParser (Parser):
             firsts = firsts.union(self.first(derivation))
         return firsts
 
-    # Function to check if the grammar is LL(1)
+    # Function to fill the table and the compiled table from the cached sets in a single pass, recording every
+    # cell with more than one derivation instead of stopping at the first one. Two derivations to epsilon are a
+    # conflict too, even if the follow of the non-terminal is empty. Returns the conflicts as
+    # (non-terminal, terminal or ε, derivations)
+    def check_ll1(self):
+        grammar = self.grammar
+        self.check_sets()
+        self.sets_report()
+        self.reset_cells()
+        parse_table = LL1Table({terminal: grammar.symbol_ids[terminal] for terminal in grammar.terminals},
+                               grammar.symbol_ids[grammar.start], len(grammar.symbols))
+        parse_table.lexer = self.build_lexer()
+        conflicts = []
+        for non_terminal, derivations in grammar.rule_ids.items():
+            symbol = grammar.symbol_ids[non_terminal]
+            # Bitset of the terminal ids of each derivation, the columns of the row filled by the derivations and
+            # the columns filled by more than one, and the derivations to epsilon
+            columns = []
+            filled = 0
+            overlap = 0
+            nullable_derivations = []
+            for derivation, rule in derivations.items():
+                symbols = grammar.rules[rule][1]
+                first, nullable = self.first_ids(symbols)
+                # If the first of the derivation contains epsilon, then it also goes to the follow of the
+                # non-terminal
+                if nullable:
+                    nullable_derivations.append(derivation)
+                    first |= self.follow_sets[symbol]
+                columns.append((derivation, first))
+                overlap |= filled & first
+                filled |= first
+                # The compiled cell has the symbols of the derivation reversed, in the order they are pushed
+                for terminal in bit_ids(first):
+                    self.insert_into_table(non_terminal, grammar.symbols[terminal], derivation)
+                    parse_table.add_cell(symbol, terminal, tuple(reversed(symbols)))
+            for terminal in bit_ids(overlap):
+                conflicts.append((non_terminal, grammar.symbols[terminal],
+                                  [derivation for derivation, first in columns if first >> terminal & 1]))
+            if len(nullable_derivations) > 1:
+                conflicts.append((non_terminal, "ε", nullable_derivations))
+        self.parse_table = parse_table
+        self.table_ready = self.table_ready and not conflicts
+        self.conflicts = conflicts
+        self.conflicts_version = grammar.version
+        return conflicts
+
+    # Function to get the conflicts of the grammar, they are checked again only if the grammar changed
+    def ll1_conflicts(self):
+        if self.conflicts is None or self.conflicts_version != self.grammar.version:
+            return self.check_ll1()
+        return self.conflicts
+
+    # Function to check if the grammar is LL(1), returns the non-terminal and the derivations of the first conflict
     def is_ll1(self):
-        for non_terminal in self.grammar.productions.keys():
-            # If the non-terminal has more than one derivation
-            if len(self.grammar.productions[non_terminal]) > 1:
-                # Check the intersection of the first of every derivation
-                for derivation in self.grammar.productions[non_terminal]:
-                    # Creta a copy of the list of derivations of the non-terminal
-                    copy = list(self.grammar.productions[non_terminal]).copy()
-                    copy.remove(derivation)
-
-                    # self.grammar.productions[non_terminal].remove(derivation)
-                    # If the first of the derivation contains a terminal that is also in the first of the others
-                    if len(self.join_firsts(
-                            copy).intersection(self.first(derivation))) > 0:
-                        return False, non_terminal, self.grammar.productions[non_terminal]
-
-                    # If the first of the derivation contains epsilon
-                    if self.first(derivation).__contains__("ε"):
-                        # If the follow of the non-terminal contains a terminal that is also in the first of the
-                        # rest of derivations, then the grammar is not LL(1)
-                        if len(self.follow(non_terminal).intersection(self.join_firsts(copy))) > 0:
-                            return False, non_terminal, self.grammar.productions[non_terminal]
-
-        return True, None, None
+        conflicts = self.ll1_conflicts()
+        if not conflicts:
+            return True, None, None
+        non_terminal = conflicts[0][0]
+        return False, non_terminal, self.grammar.productions[non_terminal]
 
     # Function to insert a value in the parsing table
     def insert_into_table(self, row, column, value):
+        row = self.row_index[row]
+        column = self.column_index[column]
         # If the cell is not empty, then add the value to the cell with a '|' separator
-        if self.table[self.rows.index(row)][self.columns.index(column)] is not None:
-            if value not in str(self.table[self.rows.index(row)][self.columns.index(column)]).split('|'):
-                self.table[self.rows.index(row)][self.columns.index(column)] += '|' + value
+        if self.table[row][column] is not None:
+            if value not in str(self.table[row][column]).split('|'):
+                self.table[row][column] += '|' + value
         else:
-            self.table[self.rows.index(row)][self.columns.index(column)] = value
+            self.table[row][column] = value
 
     # Function to create the parsing table
     def create_table(self):
-        # Is the grammar LL(1)?
-        is_ll1, non_terminal, derivations = self.is_ll1()
-
-        if not is_ll1:
-            production = non_terminal + " -> " + ("|".join(derivations))
-            raise NotLL1Exception("The grammar is not LL(1) because of the production: " + production)
-        # Go through every production of the grammar
-        for non_terminal, derivations in self.grammar.productions.items():
-            # For each derivation of the non-terminal
-            for derivation in derivations:
-                # First of the derivation
-                first = self.first(derivation)
-                # If the first of the derivation contains epsilon, then add the terminals in the follow
-                # of the non-terminal to the table
-                if "ε" in first:
-                    first.remove("ε")
-                    follow = self.follow(non_terminal)
-                    # Add every terminal in the follow of the non-terminal to the table
-                    for terminal in follow:
-                        self.insert_into_table(non_terminal, terminal, derivation)
-                # Add every terminal in the first of the derivation to the table
-                for terminal in first:
-                    self.insert_into_table(non_terminal, terminal, derivation)
+        # If the table of this grammar is in the cache, then load it instead of building it
+        fingerprint = None
+        if self.cache_dir is not None:
+            fingerprint = grammar_fingerprint(self.grammar, "ll1")
+            cached = load_table(self.cache_dir, fingerprint)
+            if cached is not None:
+                self.rows = cached["rows"]
+                self.columns = cached["columns"]
+                self.row_index = {row: index for index, row in enumerate(self.rows)}
+                self.column_index = {column: index for index, column in enumerate(self.columns)}
+                self.table = cached["table"]
+                self.parse_table = cached["parse_table"]
+                self.parse_table.lexer = self.build_lexer()
+                self.restore_sets(cached["sets"])
+                self.sets_report()
+                # Only the tables without conflicts are stored
+                self.conflicts = []
+                self.conflicts_version = self.grammar.version
+                self.table_ready = True
+                self.table_rules = list(self.grammar.rules)
+                return
+        # The check fills the table, so it is only used if the grammar is LL(1)
+        conflicts = self.ll1_conflicts()
+        if conflicts:
+            non_terminal = conflicts[0][0]
+            production = non_terminal + " -> " + ("|".join(self.grammar.productions[non_terminal]))
+            raise NotLL1Exception("The grammar is not LL(1) because of the production: " + production + "".join(
+                "\n[{}, {}]: {} -> {}".format(row, column, row, "|".join(derivation or "ε" for derivation in cell))
+                for row, column, cell in conflicts))
+        self.table_ready = True
+        self.table_rules = list(self.grammar.rules)
+        self.store_cached_table(fingerprint)
 
-    # Function to parse a string using a LL(1) grammar
-    def parse(self, string: str):
-        # If the table is not filled, then fill it
-        if not self.is_filled():
+    # Function to store the table in the cache, if there is a cache directory
+    def store_cached_table(self, fingerprint: str = None):
+        if self.cache_dir is not None:
+            if fingerprint is None:
+                fingerprint = grammar_fingerprint(self.grammar, "ll1")
+            store_table(self.cache_dir, fingerprint, {"rows": self.rows, "columns": self.columns, "table": self.table,
+                                                      "parse_table": self.parse_table, "sets": self.stored_sets()})
+
+    # Function to get the compiled table, if the table is not filled, then fill it
+    def compiled_table(self):
+        if not self.table_ready:
             self.create_table()
+        return self.parse_table
 
-        # Add $ to the end of the string
-        string += "$"
-        # Stack to store the symbols
-        stack = deque()
-        # Add $ to the stack
-        stack.append("$")
-        # Add the start symbol to the stack
-        stack.append(self.grammar.start)
-        # Index of the current character in the string
-        index = 0
-        # While the stack is not empty
-        while stack:
-            # Get the top of the stack
-            top = stack.pop()
-            # If the top of the stack is a terminal
-            if top in self.columns:
-                # If the top of the stack is the current character
-                if top == string[index]:
-                    # Advance the index
-                    index += 1
-                else:
-                    # Error
-                    return False
-            else:
-                # If the top of the stack is a non-terminal
-                # Get the values from the table
-                value = self.table[self.rows.index(top)][self.columns.index(string[index])]
-                # If the values is None, then the string is not accepted
-                if value is None:
-                    return False
-                pattern = re.compile(r"([A-Z]\'*|.)")
-                # Get the symbols in the derivation
-                symbols = pattern.findall(value)
-                symbols.reverse()
-                for symbol in symbols:
-                    # If the symbol is not epsilon, then add it to the stack
-                    if symbol != "ε":
-                        stack.append(symbol)
+    # Function to parse a string using a LL(1) grammar
+    def parse(self, string: str):
+        return self.compiled_table().parse(string)
 
-        return True
+    # Function to parse a string building its parse tree, returns None if the string is not accepted
+    def parse_tree(self, string: str):
+        return self.compiled_table().parse_tree(string, self.grammar.symbols)
 
     # Function to check the longest element in the table to print it uniformly
     def check_longest_table_element(self):
@@ -212,3 +327,314 @@ class TopDownParser (Parser):
             string += "\n"
 
         return string
+
+
+# Class with the compiled table of the top-down parser, the rows are indexed by the id of the non-terminal and the
+# columns by the id of the terminal, each cell has the symbol ids of the derivation reversed, without epsilon
+class LL1Table:
+    def __init__(self, symbol_ids: dict, start: int, symbols: int):
+        # Ids of the terminals, used to translate the input
+        self.symbol_ids = symbol_ids
+        self.start = start
+        # Row of each symbol id, None for the terminals and $
+        self.rows = [None] * symbols
+        # Length of the longest derivation in the table
+        self.longest = 0
+        # Lexer of the tokens of the grammar, None if every terminal is a character
+        self.lexer = None
+
+    # Function to add the new symbols of the grammar, the rows of the new symbols are empty
+    def update_symbols(self, symbol_ids: dict, start: int, symbols: int):
+        self.symbol_ids = symbol_ids
+        self.start = start
+        added = symbols - len(self.rows)
+        if added > 0:
+            for row in self.rows:
+                if row is not None:
+                    row.extend([None] * added)
+            self.rows.extend([None] * added)
+
+    # Function to set the derivation of a cell
+    def add_cell(self, non_terminal: int, terminal: int, symbols: tuple):
+        if self.rows[non_terminal] is None:
+            self.rows[non_terminal] = [None] * len(self.rows)
+        self.rows[non_terminal][terminal] = symbols
+        self.longest = max(self.longest, len(symbols))
+
+    # Function to translate a string into the list of its terminal ids ending with the $ id, returns None if the
+    # string has a symbol that is not a terminal. With a lexer the position where each token starts and ends is
+    # added to starts and ends, without it every symbol is a character
+    def translate(self, string: str, starts: list = None, ends: list = None):
+        if self.lexer is not None:
+            return self.lexer.tokenize(string, starts, ends)
+        symbol_ids = self.symbol_ids
+        tokens = [symbol_ids.get(symbol, -1) for symbol in string]
+        if -1 in tokens:
+            return None
+        tokens.append(0)
+        return tokens
+
+    # Function to parse a string
+    def parse(self, string: str):
+        tokens = self.translate(string)
+        if tokens is None:
+            return False
+        return self.recognize(tokens)
+
+    # Function to recognize the terminal ids of a string ending with the $ id, any sequence of integers that can be
+    # indexed, like a list or bytes
+    def recognize(self, tokens):
+        rows = self.rows
+        # Stack with $ and the start symbol
+        stack = [0, self.start]
+        # Index of the current symbol in the string
+        index = 0
+        token = tokens[0]
+        while stack:
+            top = stack.pop()
+            row = rows[top]
+            # If the top of the stack is a terminal, it must be the current symbol
+            if row is None:
+                if top != token:
+                    return False
+                # $ is the last symbol of the string and the bottom of the stack
+                if token == 0:
+                    return True
+                index += 1
+                token = tokens[index]
+            else:
+                # If the top of the stack is a non-terminal, replace it with the derivation in the table
+                symbols = row[token]
+                # If the cell is empty, then the string is not accepted
+                if symbols is None:
+                    return False
+                stack.extend(symbols)
+        return True
+
+    # Function to recognize the terminal ids of a string like recognize, adding its steps and the rows and cells it
+    # reads to the statistics
+    def profile(self, tokens, stats):
+        rows = self.rows
+        row_counts = stats.rows
+        cell_counts = stats.cells
+        expansions = 0
+        matches = 0
+        lookups = 0
+        accepted = True
+        stack = [0, self.start]
+        index = 0
+        token = tokens[0]
+        while stack:
+            top = stack.pop()
+            row = rows[top]
+            if row is None:
+                if top != token:
+                    accepted = False
+                    break
+                matches += 1
+                if token == 0:
+                    break
+                index += 1
+                token = tokens[index]
+            else:
+                row_counts[top] += 1
+                cell_counts[top, token] += 1
+                lookups += 1
+                symbols = row[token]
+                if symbols is None:
+                    accepted = False
+                    break
+                expansions += 1
+                stack.extend(symbols)
+        stats.add_parse(accepted, lookups, expand=expansions, match=matches)
+        return accepted
+
+    # Function to parse a string building its parse tree, returns None if the string is not accepted.
+    # It is the same loop of parse, with the node of each symbol of the stack, the children of a non-terminal are
+    # added when it is replaced by its derivation, so the parent is added before its children
+    def parse_tree(self, string: str, symbol_names: list):
+        token_starts = []
+        token_ends = []
+        tokens = self.translate(string, token_starts, token_ends)
+        if tokens is None:
+            return None
+        tree = ParseTree(string, symbol_names)
+        symbols = tree.symbols
+        first_child = tree.first_child
+        next_sibling = tree.next_sibling
+        starts = tree.start
+        ends = tree.end
+        rows = self.rows
+        # Values of the new children, the spans are set when they are popped from the stack
+        empty = array("i", [-1]) * self.longest
+        tree.root = tree.add_node(self.start, 0, 0)
+        stack = [0, self.start]
+        # Node of each symbol of the stack, $ has no node
+        nodes = [-1, tree.root]
+        index = 0
+        token = tokens[0]
+        while True:
+            top = stack.pop()
+            node = nodes.pop()
+            row = rows[top]
+            if row is None:
+                if top != token:
+                    return None
+                if token == 0:
+                    break
+                starts[node] = index
+                ends[node] = index + 1
+                index += 1
+                token = tokens[index]
+            else:
+                derivation = row[token]
+                if derivation is None:
+                    return None
+                # The span of a derivation to epsilon is empty, the other spans are set after the parse
+                starts[node] = index
+                ends[node] = index
+                if derivation:
+                    count = len(derivation)
+                    # The children are added from left to right, the derivation is reversed, and each child is
+                    # the sibling of the previous one
+                    first = len(symbols)
+                    last = first + count - 1
+                    symbols.extend(reversed(derivation))
+                    first_child.extend(empty[:count])
+                    next_sibling.extend(range(first + 1, last + 1))
+                    next_sibling.append(-1)
+                    starts.extend(empty[:count])
+                    ends.extend(empty[:count])
+                    first_child[node] = first
+                    # Until the span is set, the end of the node is its last child
+                    ends[node] = last
+                    stack.extend(derivation)
+                    nodes.extend(range(last, first - 1, -1))
+        # The children of a node are added after it, so going backwards every child has its span when its parent
+        # takes the span from its first to its last child
+        for node in range(len(symbols) - 1, -1, -1):
+            child = first_child[node]
+            if child != -1:
+                starts[node] = starts[child]
+                ends[node] = ends[ends[node]]
+        if token_starts:
+            tree.map_spans(token_starts, token_ends)
+        return tree
+
+    # Function to create a push parser that reads the string in chunks
+    def push_parser(self):
+        return LL1PushParser(self)
+
+    # Function to get the table compressed with row displacement, it parses the same strings using less memory
+    def compress(self):
+        return CompressedLL1Table(self)
+
+
+# Class with the compiled table of the top-down parser compressed with row displacement, the rows of the
+# non-terminals are packed into a single vector with the number of the derivation of each cell and its check.
+# The stack has the base of each non-terminal and -(id + 1) for each terminal, so a non-terminal is replaced without
+# looking for its row. It has the same cells as the LL1Table and only recognizes strings
+class CompressedLL1Table:
+    def __init__(self, table: LL1Table):
+        self.symbol_ids = table.symbol_ids
+        self.lexer = table.lexer
+        # Number of each different derivation of the table, the cells have the numbers
+        numbers = {}
+        rows = []
+        for row in table.rows:
+            if row is not None:
+                row = [(column, numbers.setdefault(derivation, len(numbers)))
+                       for column, derivation in enumerate(row) if derivation is not None]
+            rows.append(row)
+        bases, self.values, self.checks = pack_rows(rows, len(table.rows), -1)
+        # Derivations with the values of the stack of their symbols
+        self.derivations = [tuple(-symbol - 1 if bases[symbol] == -1 else bases[symbol] for symbol in derivation)
+                            for derivation in numbers]
+        # Base of the start symbol, a start symbol without row is written like the symbols of the derivations without
+        # row, as -(id + 1), so it is never matched and its strings are rejected
+        self.start = -table.start - 1 if bases[table.start] == -1 else bases[table.start]
+
+    # The input is translated like in the LL1Table
+    translate = LL1Table.translate
+
+    # Function to parse a string
+    def parse(self, string: str):
+        tokens = self.translate(string)
+        if tokens is None:
+            return False
+        return self.recognize(tokens)
+
+    # Function to recognize the terminal ids of a string ending with the $ id, it is the loop of LL1Table.recognize
+    # with the bases of the non-terminals in the stack
+    def recognize(self, tokens):
+        values = self.values
+        checks = self.checks
+        derivations = self.derivations
+        stack = [-1, self.start]
+        index = 0
+        token = tokens[0]
+        while stack:
+            top = stack.pop()
+            if top < 0:
+                if -top - 1 != token:
+                    return False
+                if token == 0:
+                    return True
+                index += 1
+                token = tokens[index]
+            else:
+                position = top + token
+                if checks[position] != top:
+                    return False
+                stack.extend(derivations[values[position]])
+        return True
+
+    # Function to create a push parser that reads the string in chunks
+    def push_parser(self):
+        return CompressedLL1PushParser(self)
+
+
+# Class to parse a string that is received in chunks with the LL(1) table, the stack has the symbols to match
+class LL1PushParser(PushParser):
+    def __init__(self, table: LL1Table):
+        super().__init__(table)
+        self.stack = [0, table.start]
+
+    # Function to replace the non-terminals of the top of the stack until the symbol is matched,
+    # returns False if the symbol is not expected
+    def push(self, token: int):
+        rows = self.table.rows
+        stack = self.stack
+        while stack:
+            top = stack.pop()
+            row = rows[top]
+            if row is None:
+                return top == token
+            symbols = row[token]
+            if symbols is None:
+                return False
+            stack.extend(symbols)
+        return False
+
+
+# Class to parse a string that is received in chunks with the compressed LL(1) table, the stack has the values of
+# the stack of CompressedLL1Table.parse
+class CompressedLL1PushParser(LL1PushParser):
+    def __init__(self, table: CompressedLL1Table):
+        super().__init__(table)
+        self.stack = [-1, table.start]
+
+    # Function to replace the non-terminals of the top of the stack until the symbol is matched,
+    # returns False if the symbol is not expected
+    def push(self, token: int):
+        table = self.table
+        stack = self.stack
+        while stack:
+            top = stack.pop()
+            if top < 0:
+                return -top - 1 == token
+            position = top + token
+            if table.checks[position] != top:
+                return False
+            stack.extend(table.derivations[table.values[position]])
+        return False